@@ -1,4 +1,5 @@
 from flask import Flask, request, render_template, redirect, url_for, flash, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
 import sqlite3
@@ -34,6 +35,7 @@ import tempfile
 from threading import Thread
 import uuid
 import time
+import numpy as np
 
 # Global progress tracking dictionary
 progress_store = {}
@@ -51,9 +53,23 @@ def track_progress(operation_id, progress_data):
     for key in to_remove:
         del progress_store[key]
 
+class NumpyJSONProvider(DefaultJSONProvider):
+    """JSON provider that also serializes NumPy scalars and arrays."""
+    
+    @staticmethod
+    def default(o):
+        # Only called for values the json module cannot encode itself, so
+        # responses are no longer pre-walked to convert NumPy types
+        if isinstance(o, np.generic):
+            return o.item()
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        return DefaultJSONProvider.default(o)
+
 def create_app(config_name='default'):
     """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.json = NumpyJSONProvider(app)
     
     # Load configuration
     app.config.from_object(config[config_name])
@@ -74,6 +90,11 @@ def create_app(config_name='default'):
     db_service = DatabaseService()
     relationship_service = RelationshipService()
     
+    @app.before_request
+    def reset_relationship_schema_cache():
+        """Keep cached column metadata scoped to a single request."""
+        relationship_service.invalidate_schema_cache()
+    
     # Initialize maintenance-specific services if available
     if MAINTENANCE_SERVICES_AVAILABLE:
         try:
@@ -108,6 +129,21 @@ def create_app(config_name='default'):
         except Exception:
             return 'Unknown'
     
+    def refresh_stock_table(*table_names):
+        """Rebuild the Stock indexes after an import that wrote the Stock table."""
+        if spare_parts_service and any(name and name.lower() == 'stock' for name in table_names):
+            spare_parts_service.prepare_stock_table()
+    
+    def suspend_stock_search(table_name):
+        """Drop the Stock full-text triggers before a bulk import into Stock."""
+        if spare_parts_service and table_name and table_name.lower() == 'stock':
+            spare_parts_service.suspend_stock_search_index()
+    
+    def stock_records_changed(table_name):
+        """Drop the cached spare parts dashboards after a generic edit of Stock."""
+        if spare_parts_service and table_name.lower() == 'stock':
+            spare_parts_service.invalidate_cached_reads()
+    
     # Configure logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
@@ -162,6 +198,10 @@ def create_app(config_name='default'):
                     logger.error(f"Failed to create database tables: {e}")
                     # Try to continue anyway, tables might already exist
                     break
+        
+        # Stock indexes are built here and after Stock imports, never on reads
+        if spare_parts_service:
+            spare_parts_service.prepare_stock_table()
     
     # Routes
     @app.route('/api/table-info/<table_name>')
@@ -510,6 +550,7 @@ def create_app(config_name='default'):
             
             # Process the file using universal processor
             upload_id, created_tables = universal_file_processor.process_file(file)
+            refresh_stock_table(*created_tables)
             
             file_type = universal_file_processor.get_file_type(file.filename)
             message = f"Successfully processed {file_type.upper()} file. Created {len(created_tables)} table(s): {', '.join(created_tables)}"
@@ -1530,6 +1571,7 @@ def create_app(config_name='default'):
             
             success = db_service.update_record(table_name, record_id, data)
             if success:
+                stock_records_changed(table_name)
                 return jsonify({'success': True, 'message': 'Record updated successfully'})
             else:
                 return jsonify({'success': False, 'error': 'Record not found or could not be updated'})
@@ -1544,6 +1586,7 @@ def create_app(config_name='default'):
         try:
             success = db_service.delete_record(table_name, record_id)
             if success:
+                stock_records_changed(table_name)
                 return jsonify({'success': True, 'message': 'Record deleted successfully'})
             else:
                 return jsonify({'success': False, 'error': 'Record not found or could not be deleted'})
@@ -1671,6 +1714,7 @@ def create_app(config_name='default'):
             upload_id, created_tables = universal_file_processor.process_excel_with_config(
                 file, selected_sheets, column_types
             )
+            refresh_stock_table(*created_tables)
             
             return jsonify({
                 'success': True,
@@ -1895,9 +1939,13 @@ def create_app(config_name='default'):
                 if not target_table:
                     return jsonify({'success': False, 'error': 'Target table is required for replace mode'})
                 
-                success, message, records_imported = enhanced_excel_processor.replace_table_data(
-                    file_path, worksheet, target_table
-                )
+                suspend_stock_search(target_table)
+                try:
+                    success, message, records_imported = enhanced_excel_processor.replace_table_data(
+                        file_path, worksheet, target_table
+                    )
+                finally:
+                    refresh_stock_table(target_table)
                 
                 # Don't delete file here - let batch processing handle it
                 
@@ -1926,6 +1974,7 @@ def create_app(config_name='default'):
                 success, message, records_imported = enhanced_excel_processor.create_new_table_from_worksheet(
                     file_path, worksheet, table_name
                 )
+                refresh_stock_table(table_name)
                 
                 # Don't delete file here - let batch processing handle it
                 
@@ -1972,13 +2021,19 @@ def create_app(config_name='default'):
                 return jsonify({'success': False, 'error': 'Target table is required for replace/append mode'})
             
             # Import worksheet using memory processing
-            result = enhanced_excel_processor.import_worksheet_from_memory(
-                file=file_data,
-                worksheet_name=worksheet_name,
-                import_mode=import_mode,
-                target_table=target_table,
-                new_table_name=new_table_name
-            )
+            if import_mode in ['replace', 'append']:
+                suspend_stock_search(target_table)
+            result = {}
+            try:
+                result = enhanced_excel_processor.import_worksheet_from_memory(
+                    file=file_data,
+                    worksheet_name=worksheet_name,
+                    import_mode=import_mode,
+                    target_table=target_table,
+                    new_table_name=new_table_name
+                )
+            finally:
+                refresh_stock_table(target_table, result.get('table_name'))
             
             return jsonify(result)
             
@@ -2423,9 +2478,14 @@ def create_app(config_name='default'):
         try:
             # Get database parameter
             database = request.args.get('database', 'excel_data')
+            # Optional cap on the rows profiled; 0 analyzes the whole table
+            sample_rows = request.args.get('sample_rows', type=int)
             
             # Perform comprehensive table analysis
-            analysis_result = relationship_service.analyze_table_data(table_name, database)
+            if sample_rows is None:
+                analysis_result = relationship_service.analyze_table_data(table_name, database)
+            else:
+                analysis_result = relationship_service.analyze_table_data(table_name, database, sample_rows or None)
             return jsonify(analysis_result)
             
         except Exception as e:
@@ -142,13 +142,19 @@ class CurrencyService:
             logger.error(f"Error getting exchange rate: {e}")
             return None
     
-    def convert_to_eur(self, xof_amount: float, force_update: bool = False) -> Optional[float]:
-        """Convert XOF amount to EUR."""
+    def convert_to_eur(self, xof_amount: float, force_update: bool = False,
+                       rate: Optional[float] = None) -> Optional[float]:
+        """Convert XOF amount to EUR.
+        
+        Callers converting many amounts can pass a ``rate`` obtained once
+        from get_exchange_rate() to skip the per-call lookup.
+        """
         try:
             if xof_amount is None or xof_amount == 0:
                 return 0.0
-                
-            rate = self.get_exchange_rate(force_update)
+            
+            if rate is None:
+                rate = self.get_exchange_rate(force_update)
             if rate is None:
                 logger.warning("No exchange rate available, returning original amount")
                 return xof_amount
@@ -191,13 +197,14 @@ class CurrencyService:
             'conversion_info': f"1 {self.base_currency} = {rate:.6f} {self.target_currency}" if rate else "No rate available"
         }
     
-    def format_currency(self, amount: float, currency: str = 'XOF', show_eur: bool = True) -> str:
-        """Format currency amount with optional EUR conversion."""
+    def format_currency(self, amount: float, currency: str = 'XOF', show_eur: bool = True,
+                        rate: Optional[float] = None) -> str:
+        """Format currency amount with optional EUR conversion at ``rate`` if given."""
         try:
             if currency == 'XOF':
                 formatted = f"{amount:,.0f} CFA"
                 if show_eur and amount > 0:
-                    eur_amount = self.convert_to_eur(amount)
+                    eur_amount = self.convert_to_eur(amount, rate=rate)
                     if eur_amount and eur_amount != amount:
                         formatted += f" (€{eur_amount:,.2f})"
                 return formatted
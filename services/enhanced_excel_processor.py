@@ -1,10 +1,10 @@
 import pandas as pd
 import os
-import re
 from typing import List, Dict, Tuple, Any, Optional
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 from models import db
+from services.excel_processor import replace_non_word_chars
 from models.base_models import UploadHistory, TableMetadata
 from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Table, inspect
 from sqlalchemy.dialects import sqlite, postgresql
@@ -35,12 +35,8 @@ class EnhancedExcelProcessor:
     
     def sanitize_table_name(self, name: str) -> str:
         """Convert sheet name to valid table name."""
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'table_' + name
@@ -57,12 +53,8 @@ class EnhancedExcelProcessor:
             return 'unnamed_column'
         
         name = str(name)
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'col_' + name
@@ -242,10 +234,9 @@ class EnhancedExcelProcessor:
                     # Convert sample data to records with proper type handling
                     try:
                         sample_records = []
-                        for _, row in df_sample.head(3).iterrows():
+                        for row in df_sample.head(3).itertuples(index=False, name=None):
                             record = {}
-                            for col in df_sample.columns:
-                                value = row[col]
+                            for col, value in zip(df_sample.columns, row):
                                 # Ensure all values are JSON serializable
                                 if pd.isna(value):
                                     record[col] = None
@@ -469,10 +460,9 @@ class EnhancedExcelProcessor:
             
             # Insert new data
             data_records = []
-            for _, row in df.iterrows():
+            for row in df.itertuples(index=False, name=None):
                 record = {}
-                for col in table_column_names:
-                    value = row[col]
+                for col, value in zip(table_column_names, row):
                     # Use safe value conversion to handle NaT and other pandas edge cases
                     record[col] = self.safe_value_conversion(value)
                 data_records.append(record)
@@ -546,11 +536,9 @@ class EnhancedExcelProcessor:
             data_records = []
             column_names = [col.name for col in columns if col.name != 'id']
             
-            for _, row in df.iterrows():
+            for row in df.itertuples(index=False, name=None):
                 record = {}
-                for i, col in enumerate(df.columns):
-                    sanitized_col = column_names[i]  # Corresponding sanitized column name
-                    value = row[col]
+                for sanitized_col, value in zip(column_names, row):
                     # Use safe value conversion to handle NaT and other pandas edge cases
                     record[sanitized_col] = self.safe_value_conversion(value)
                 data_records.append(record)
@@ -671,10 +659,9 @@ class EnhancedExcelProcessor:
             
             # Prepare data for insertion
             data_records = []
-            for _, row in df.iterrows():
+            for row in df.itertuples(index=False, name=None):
                 record = {}
-                for col in df.columns:
-                    value = row[col]
+                for col, value in zip(df.columns, row):
                     # Apply safe datetime conversion
                     cleaned_value = self._safe_datetime_convert(value)
                     record[col] = cleaned_value
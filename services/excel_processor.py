@@ -8,6 +8,22 @@ from models.base_models import UploadHistory, TableMetadata
 from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Table
 from sqlalchemy.dialects import sqlite, postgresql
 from datetime import datetime
+from services.identifiers import ASCII_NON_WORD_TABLE
+
+_NON_WORD_PATTERN = re.compile(r'\W')
+
+
+def replace_non_word_chars(name: str) -> str:
+    """Replace non-word characters with underscores and collapse underscore runs."""
+    if name.isascii():
+        name = name.translate(ASCII_NON_WORD_TABLE)
+    else:
+        # Unicode headers keep the regex path so non-ASCII letters survive
+        name = _NON_WORD_PATTERN.sub('_', name)
+    while '__' in name:
+        name = name.replace('__', '_')
+    return name
+
 
 class ExcelProcessor:
     """Service class for processing Excel files and creating database tables."""
@@ -23,12 +39,8 @@ class ExcelProcessor:
     
     def sanitize_table_name(self, name: str) -> str:
         """Convert sheet name to valid table name."""
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'table_' + name
@@ -45,12 +57,8 @@ class ExcelProcessor:
             return 'unnamed_column'
         
         name = str(name)
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'col_' + name
@@ -103,24 +111,31 @@ class ExcelProcessor:
         
         return value
 
-    def infer_column_type(self, series: pd.Series) -> Any:
-        """Infer the best SQLAlchemy column type for a pandas series."""
+    def infer_column_type(self, series: pd.Series, dtype: Any = None) -> Any:
+        """Infer the best SQLAlchemy column type for a pandas series.
+        
+        ``dtype`` may be supplied when the caller already looked it up, so
+        the series metadata is not inspected a second time.
+        """
         # Remove null values for type inference
         non_null_series = series.dropna()
         
         if len(non_null_series) == 0:
             return Text
         
+        if dtype is None:
+            dtype = non_null_series.dtype
+        
         # Check if it's numeric
-        if pd.api.types.is_numeric_dtype(non_null_series):
+        if pd.api.types.is_numeric_dtype(dtype):
             # Check if it's integer
-            if pd.api.types.is_integer_dtype(non_null_series):
+            if pd.api.types.is_integer_dtype(dtype):
                 return Integer
             else:
                 return Float
         
         # Check if it's datetime
-        if pd.api.types.is_datetime64_any_dtype(non_null_series):
+        if pd.api.types.is_datetime64_any_dtype(dtype):
             return DateTime
         
         # Check string length to decide between String and Text
@@ -159,8 +174,12 @@ class ExcelProcessor:
             except Exception:
                 raise Exception(f"Could not read Excel file: {str(e)}")
     
-    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str) -> Table:
+    def create_table_from_dataframe(self, df: pd.DataFrame, table_name: str,
+                                    dtypes: Dict[Any, Any] = None) -> Table:
         """Create SQLAlchemy table from pandas DataFrame."""
+        if dtypes is None:
+            dtypes = df.dtypes.to_dict()
+        
         columns = []
         
         # Add auto-incrementing ID column
@@ -177,7 +196,7 @@ class ExcelProcessor:
                 sanitized_name = f"{original_name}_{counter}"
                 counter += 1
             
-            col_type = self.infer_column_type(df[col])
+            col_type = self.infer_column_type(df[col], dtypes.get(col))
             columns.append(Column(sanitized_name, col_type))
         
         # Create table
@@ -219,10 +238,12 @@ class ExcelProcessor:
                 df = df.loc[:, ~df.columns.duplicated()]  # Remove duplicate columns
                 
                 # Clean datetime columns to handle NaT values properly
+                dtypes = df.dtypes.to_dict()
                 for col in df.columns:
-                    if pd.api.types.is_datetime64_any_dtype(df[col]):
+                    if pd.api.types.is_datetime64_any_dtype(dtypes[col]):
                         # Convert problematic datetime values to None
                         df[col] = df[col].apply(lambda x: None if pd.isna(x) else x)
+                        dtypes[col] = df[col].dtype
                 
                 if df.empty:
                     continue
@@ -238,24 +259,28 @@ class ExcelProcessor:
                     counter += 1
                 
                 # Create table in database
-                table = self.create_table_from_dataframe(df, table_name)
+                table = self.create_table_from_dataframe(df, table_name, dtypes=dtypes)
                 table.create(db.engine, checkfirst=True)
                 
-                # Insert data into table
+                # Resolve the sanitized column names once per sheet
+                existing_cols = [c.name for c in table.columns if c.name != 'id']
+                sanitized_cols = []
+                for i, col in enumerate(df.columns):
+                    sanitized_col = self.sanitize_column_name(col)
+                    # Handle duplicate column names like in table creation
+                    original_name = sanitized_col
+                    col_counter = 1
+                    while sanitized_col in existing_cols[:i]:
+                        sanitized_col = f"{original_name}_{col_counter}"
+                        col_counter += 1
+                    sanitized_cols.append(sanitized_col)
+                
+                # Insert data into table; itertuples yields plain tuples
+                # instead of allocating a Series per row like iterrows
                 data_records = []
-                for _, row in df.iterrows():
+                for row in df.itertuples(index=False, name=None):
                     record = {}
-                    for i, col in enumerate(df.columns):
-                        sanitized_col = self.sanitize_column_name(col)
-                        # Handle duplicate column names like in table creation
-                        original_name = sanitized_col
-                        col_counter = 1
-                        existing_cols = [c.name for c in table.columns if c.name != 'id']
-                        while sanitized_col in existing_cols[:i]:
-                            sanitized_col = f"{original_name}_{col_counter}"
-                            col_counter += 1
-                        
-                        value = row[col]
+                    for sanitized_col, value in zip(sanitized_cols, row):
                         # Use safe value conversion to handle NaT and other pandas edge cases
                         record[sanitized_col] = self.safe_value_conversion(value)
                     data_records.append(record)
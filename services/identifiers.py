@@ -0,0 +1,11 @@
+"""
+Identifier Helpers
+Shared tables for sanitizing sheet and column names into SQL identifiers
+"""
+
+# Every ASCII character that is not [A-Za-z0-9_] maps to an underscore, so
+# the common ASCII-only header is sanitized in a single C-level pass.
+ASCII_NON_WORD_TABLE = str.maketrans({
+    chr(code): '_' for code in range(128)
+    if not (chr(code).isalnum() or chr(code) == '_')
+})
@@ -15,7 +15,9 @@ class MaintenanceService:
     
     def __init__(self):
         """Initialize the maintenance service."""
-        pass
+        # Refresh bookkeeping for the equipment criticality cache table
+        self._criticality_refreshed_at = None
+        self._criticality_refresh_interval = 300  # 5 minutes
     
     def get_maintenance_kpis(self):
         """Get key performance indicators for maintenance operations."""
@@ -112,31 +114,31 @@ class MaintenanceService:
             try:
                 result = db.session.execute(text("""
                     SELECT 
-                        AVG(CASE WHEN status = 'Running' THEN 100 ELSE 0 END) as availability
+                        ROUND(AVG(CASE WHEN status = 'Running' THEN 100 ELSE 0 END), 1) as availability
                     FROM equipment
                 """))
-                performance['availability'] = round(result.scalar() or 0, 1)
+                performance['availability'] = float(result.scalar() or 0)
             except:
                 performance['availability'] = 0
             
             # Mean Time Between Failures (MTBF)
             try:
                 result = db.session.execute(text("""
-                    SELECT AVG(time_between_failures) as mtbf
+                    SELECT ROUND(AVG(time_between_failures), 1) as mtbf
                     FROM equipment_metrics
                 """))
-                performance['mtbf'] = round(result.scalar() or 0, 1)
+                performance['mtbf'] = float(result.scalar() or 0)
             except:
                 performance['mtbf'] = 0
             
             # Mean Time To Repair (MTTR)
             try:
                 result = db.session.execute(text("""
-                    SELECT AVG(repair_time_hours) as mttr
+                    SELECT ROUND(AVG(repair_time_hours), 1) as mttr
                     FROM work_orders 
                     WHERE status = 'Completed' AND repair_time_hours IS NOT NULL
                 """))
-                performance['mttr'] = round(result.scalar() or 0, 1)
+                performance['mttr'] = float(result.scalar() or 0)
             except:
                 performance['mttr'] = 0
             
@@ -179,11 +181,11 @@ class MaintenanceService:
             # Stock turnover
             try:
                 result = db.session.execute(text("""
-                    SELECT AVG(annual_usage / NULLIF(quantity_on_hand, 0)) as turnover
+                    SELECT ROUND(AVG(annual_usage / NULLIF(quantity_on_hand, 0)), 2) as turnover
                     FROM spare_parts 
                     WHERE quantity_on_hand > 0
                 """))
-                stats['turnover'] = round(result.scalar() or 0, 2)
+                stats['turnover'] = float(result.scalar() or 0)
             except:
                 stats['turnover'] = 0
             
@@ -200,36 +202,36 @@ class MaintenanceService:
             
             # Total maintenance costs
             try:
-                result = db.session.execute(text("SELECT SUM(total_cost) FROM work_orders WHERE total_cost IS NOT NULL"))
-                costs['total'] = round(result.scalar() or 0, 2)
+                result = db.session.execute(text("SELECT ROUND(SUM(total_cost), 2) FROM work_orders WHERE total_cost IS NOT NULL"))
+                costs['total'] = float(result.scalar() or 0)
             except:
                 costs['total'] = 0
             
             # Labor costs
             try:
-                result = db.session.execute(text("SELECT SUM(labor_cost) FROM work_orders WHERE labor_cost IS NOT NULL"))
-                costs['labor'] = round(result.scalar() or 0, 2)
+                result = db.session.execute(text("SELECT ROUND(SUM(labor_cost), 2) FROM work_orders WHERE labor_cost IS NOT NULL"))
+                costs['labor'] = float(result.scalar() or 0)
             except:
                 costs['labor'] = 0
             
             # Parts costs
             try:
-                result = db.session.execute(text("SELECT SUM(parts_cost) FROM work_orders WHERE parts_cost IS NOT NULL"))
-                costs['parts'] = round(result.scalar() or 0, 2)
+                result = db.session.execute(text("SELECT ROUND(SUM(parts_cost), 2) FROM work_orders WHERE parts_cost IS NOT NULL"))
+                costs['parts'] = float(result.scalar() or 0)
             except:
                 costs['parts'] = 0
             
             # Monthly average
             try:
                 result = db.session.execute(text("""
-                    SELECT AVG(monthly_cost) FROM (
+                    SELECT ROUND(AVG(monthly_cost), 2) FROM (
                         SELECT SUM(total_cost) as monthly_cost
                         FROM work_orders 
                         WHERE completion_date >= date('now', '-12 months')
                         GROUP BY strftime('%Y-%m', completion_date)
                     )
                 """))
-                costs['monthly_average'] = round(result.scalar() or 0, 2)
+                costs['monthly_average'] = float(result.scalar() or 0)
             except:
                 costs['monthly_average'] = 0
             
@@ -271,20 +273,97 @@ class MaintenanceService:
             logger.error(f"Error getting maintenance trends: {str(e)}")
             return {'work_orders': []}
     
+    def _refresh_equipment_criticality(self, force=False):
+        """Rebuild the equipment_criticality_mv cache table when it is stale.
+        
+        The one-year aggregate over work_orders changes slowly, so it is
+        materialized into a plain table and rebuilt at most every
+        ``_criticality_refresh_interval`` seconds instead of on every
+        dashboard load.
+        
+        The rebuild runs on its own engine transaction, never the request
+        session. Its first write claims the refreshed_at row in
+        equipment_criticality_refresh only while that row is stale, so when
+        several workers find the table stale at once, one rebuilds it and
+        the others skip.
+        """
+        now = datetime.now()
+        if (not force and self._criticality_refreshed_at is not None and
+                (now - self._criticality_refreshed_at).total_seconds() < self._criticality_refresh_interval):
+            return
+        
+        with db.engine.begin() as connection:
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS equipment_criticality_refresh (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    refreshed_at TEXT
+                )
+            """))
+            connection.execute(text("""
+                CREATE TABLE IF NOT EXISTS equipment_criticality_mv (
+                    equipment_id INTEGER,
+                    equipment_name TEXT,
+                    work_order_count INTEGER,
+                    total_cost REAL,
+                    avg_downtime REAL
+                )
+            """))
+            connection.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_equipment_criticality_mv_rank
+                ON equipment_criticality_mv (work_order_count DESC, total_cost DESC)
+            """))
+            connection.execute(text(
+                "INSERT OR IGNORE INTO equipment_criticality_refresh (id, refreshed_at) VALUES (1, NULL)"
+            ))
+            
+            # Claim the refresh; the transaction's write lock, taken by the
+            # first write above, is held until commit
+            claim = """
+                UPDATE equipment_criticality_refresh
+                SET refreshed_at = datetime('now')
+                WHERE id = 1
+            """
+            if not force:
+                claim += """
+                  AND (refreshed_at IS NULL
+                       OR refreshed_at < datetime('now', :max_age))
+                """
+            claimed = connection.execute(
+                text(claim), {'max_age': f'-{self._criticality_refresh_interval} seconds'}
+            ).rowcount
+            
+            if claimed:
+                connection.execute(text("DELETE FROM equipment_criticality_mv"))
+                connection.execute(text("""
+                    INSERT INTO equipment_criticality_mv
+                        (equipment_id, equipment_name, work_order_count, total_cost, avg_downtime)
+                    SELECT 
+                        equipment_id,
+                        equipment_name,
+                        COUNT(*) as work_order_count,
+                        SUM(total_cost) as total_cost,
+                        AVG(downtime_hours) as avg_downtime
+                    FROM work_orders wo
+                    LEFT JOIN equipment e ON wo.equipment_id = e.id
+                    WHERE wo.created_date >= date('now', '-1 year')
+                    GROUP BY equipment_id, equipment_name
+                """))
+        # Another worker's fresh rebuild counts as this process's refresh too
+        self._criticality_refreshed_at = now
+    
     def get_equipment_criticality_analysis(self):
         """Analyze equipment criticality based on maintenance frequency and costs."""
         try:
+            self._refresh_equipment_criticality()
+            
             result = db.session.execute(text("""
                 SELECT 
                     equipment_id,
                     equipment_name,
-                    COUNT(*) as work_order_count,
-                    SUM(total_cost) as total_cost,
-                    AVG(downtime_hours) as avg_downtime
-                FROM work_orders wo
-                LEFT JOIN equipment e ON wo.equipment_id = e.id
-                WHERE wo.created_date >= date('now', '-1 year')
-                GROUP BY equipment_id, equipment_name
+                    work_order_count,
+                    total_cost,
+                    ROUND(avg_downtime, 1) as avg_downtime
+                FROM equipment_criticality_mv
                 ORDER BY work_order_count DESC, total_cost DESC
                 LIMIT 20
             """))
@@ -295,7 +374,7 @@ class MaintenanceService:
                     'equipment_name': row[1] or f'Equipment {row[0]}',
                     'work_orders': row[2],
                     'total_cost': row[3] or 0,
-                    'avg_downtime': round(row[4] or 0, 1)
+                    'avg_downtime': float(row[4] or 0)
                 }
                 for row in result.fetchall()
             ]
@@ -1,32 +1,111 @@
-from typing import List, Dict, Any, Optional, Tuple
+from __future__ import annotations
+
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
-import pandas as pd
 import os
 from datetime import datetime
 from sqlalchemy import (
     Table, Column, Integer, String, Float, DateTime, Text, 
-    MetaData, create_engine, inspect
+    MetaData, create_engine, inspect, text
 )
 from sqlalchemy.exc import SQLAlchemyError
 from models import db
 from models.base_models import UploadHistory, TableMetadata
 import tempfile
+import shutil
+import itertools
 import io
+import json
+import re
+from services.identifiers import ASCII_NON_WORD_TABLE
+
+try:
+    import ciso8601
+except ImportError:  # Optional C parser for the per-value ISO date fallback
+    ciso8601 = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:  # Optional Rust workbook reader; openpyxl is used without it
+    CalamineWorkbook = None
+
+# pandas and openpyxl are imported inside the methods that use them so that
+# workers which never handle an Excel upload do not pay their import cost
+if TYPE_CHECKING:
+    import pandas as pd
+
+_NON_ASCII_WORD_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
+_UNDERSCORE_RUN_PATTERN = re.compile(r'_+')
+_ISO_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}:\d{2})?$')
+
+# Non-null values sampled when deciding whether a text column holds ISO dates
+_DATE_SAMPLE_SIZE = 50
+
+# Row count above which PostgreSQL imports switch from executemany to COPY
+_COPY_THRESHOLD_ROWS = 10000
+
+# Uploads larger than this are spooled to disk rather than kept in memory
+_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+# Reader for each workbook format when python-calamine is not installed
+_ENGINE_BY_EXTENSION = {
+    'xlsx': 'openpyxl',
+    'xlsm': 'openpyxl',
+    'xls': 'xlrd',
+    'xlsb': 'pyxlsb',
+}
+
+def _parse_iso_datetime(value):
+    """Parse one ISO-8601 value with ciso8601, returning None when it fails."""
+    try:
+        return ciso8601.parse_datetime(str(value))
+    except ValueError:
+        return None
+
+def _calamine_cell(value):
+    """Map a blank calamine cell to None and a whole-number float to int."""
+    if value == '':
+        return None
+    # calamine reads every numeric xlsx cell as float; openpyxl and pandas'
+    # calamine reader give whole numbers back as int
+    if type(value) is float and value.is_integer():
+        return int(value)
+    return value
+
+def _calamine_rows(sheet):
+    """Yield a parsed calamine sheet's rows as tuples of converted cells."""
+    for row in sheet.to_python():
+        yield tuple(map(_calamine_cell, row))
+
+def _pandas_sheet_rows(excel_file, sheet_name: str):
+    """Yield a sheet read through pandas as tuples, mapping NaN to None."""
+    frame = excel_file.parse(sheet_name, header=None)
+    frame = frame.astype(object).where(frame.notna(), None)
+    yield from frame.itertuples(index=False, name=None)
 
 class InMemoryExcelProcessor:
     """Enhanced Excel processor that processes files in memory without saving to disk."""
     
     def __init__(self, db_session=None):
         self.db = db_session or db
-        self.allowed_extensions = {'xlsx', 'xls', 'xlsm'}  # Added .xlsm support
+        self.allowed_extensions = {'xlsx', 'xls', 'xlsm', 'xlsb'}  # Added .xlsm and .xlsb support
+        # Reflected tables keyed by name, so imports skip catalog queries
+        self._table_cache: Dict[str, Table] = {}
     
     def allowed_file(self, filename: str) -> bool:
         """Check if file has allowed extension."""
         return '.' in filename and filename.rsplit('.', 1)[1].lower() in self.allowed_extensions
     
     def _safe_datetime_convert(self, value):
-        """Safely convert values that might cause datetime issues."""
+        """
+        Safely convert values that might cause datetime issues.
+        
+        Whole columns are cleaned vectorised in _clean_dataframe; this is
+        kept for converting individual cells.
+        """
+        import pandas as pd
+        
         if pd.isna(value):
             return None
         
@@ -57,47 +136,72 @@ class InMemoryExcelProcessor:
         Read Excel file from memory and return information about each worksheet.
         Returns dict with sheet names as keys and metadata as values.
         """
+        import pandas as pd
+        
         try:
-            # Read file content into memory
-            file_content = file.read()
-            file.seek(0)  # Reset file pointer for future reads
-            
-            # Create a BytesIO object to work with pandas
-            file_buffer = io.BytesIO(file_content)
-            
-            # Read all sheets without loading full data
-            xl_file = pd.ExcelFile(file_buffer, engine='openpyxl')
-            sheets_info = {}
-            
-            for sheet_name in xl_file.sheet_names:
-                try:
-                    # Read just the first few rows to get column info and check data
-                    df_sample = pd.read_excel(file_buffer, sheet_name=sheet_name, nrows=5, engine='openpyxl')
-                    
-                    # Read full sheet to get accurate row count
-                    df_full = pd.read_excel(file_buffer, sheet_name=sheet_name, engine='openpyxl')
-                    
-                    # Reset buffer position for next sheet
-                    file_buffer.seek(0)
-                    
-                    sheets_info[sheet_name] = {
-                        'columns': list(df_sample.columns),
-                        'column_count': len(df_sample.columns),
-                        'row_count': len(df_full),
-                        'sample_data': df_sample.head(3).to_dict('records') if not df_sample.empty else [],
-                        'has_data': not df_full.empty,
-                        'error': None
-                    }
-                    
-                except Exception as e:
-                    sheets_info[sheet_name] = {
-                        'columns': [],
-                        'column_count': 0,
-                        'row_count': 0,
-                        'sample_data': [],
-                        'has_data': False,
-                        'error': str(e)
-                    }
+            # Spool the upload instead of holding a second copy in memory
+            with self._spool_upload(file) as file_buffer:
+                sheets_info = {}
+                
+                # Each sheet is opened once and its rows streamed, instead of
+                # every sheet being parsed twice through pandas
+                extension = self._file_extension(file.filename)
+                for sheet_name, load_rows, count_rows in self._iter_worksheets(file_buffer, extension):
+                    try:
+                        rows = iter(load_rows())
+                        
+                        # First row holds the headers
+                        header = next(rows, None) or ()
+                        columns = [
+                            value if value is not None else f'Unnamed: {index}'
+                            for index, value in enumerate(header)
+                        ]
+                        
+                        # The sheet's stored dimensions give the row count
+                        # without reading every row; only sheets that lack
+                        # them are streamed through to count non-empty rows
+                        sheet_rows = count_rows()
+                        sample_data = []
+                        streamed_rows = 0
+                        for row in rows:
+                            if all(value is None for value in row):
+                                continue
+                            if len(sample_data) < 3:
+                                sample_data.append(dict(zip(columns, row)))
+                            elif sheet_rows is not None:
+                                break
+                            streamed_rows += 1
+                        
+                        if sheet_rows is not None:
+                            row_count = max(sheet_rows - 1, 0)  # minus the header row
+                        else:
+                            row_count = streamed_rows
+                        
+                        if sample_data:
+                            # pandas' JSON writer turns NaN/NaT into null and
+                            # dates into ISO strings in one C-level pass
+                            sample_data = json.loads(pd.DataFrame(sample_data).to_json(
+                                orient='records', date_format='iso', default_handler=str
+                            ))
+                        
+                        sheets_info[sheet_name] = {
+                            'columns': columns,
+                            'column_count': len(columns),
+                            'row_count': row_count,
+                            'sample_data': sample_data,
+                            'has_data': row_count > 0,
+                            'error': None
+                        }
+                        
+                    except Exception as e:
+                        sheets_info[sheet_name] = {
+                            'columns': [],
+                            'column_count': 0,
+                            'row_count': 0,
+                            'sample_data': [],
+                            'has_data': False,
+                            'error': str(e)
+                        }
             
             return sheets_info
             
@@ -111,15 +215,11 @@ class InMemoryExcelProcessor:
         Import a specific worksheet to database table without saving file to disk.
         """
         try:
-            # Read file content into memory
-            file_content = file.read()
-            file.seek(0)  # Reset file pointer
-            
-            # Create a BytesIO object to work with pandas
-            file_buffer = io.BytesIO(file_content)
-            
-            # Read the specific worksheet
-            df = pd.read_excel(file_buffer, sheet_name=worksheet_name, engine='openpyxl')
+            # Spool the upload instead of holding a second copy in memory
+            with self._spool_upload(file) as file_buffer:
+                # Read the specific worksheet
+                df = self._read_sheet_fast(file_buffer, worksheet_name,
+                                           self._file_extension(file.filename))
             
             if df.empty:
                 return {
@@ -174,26 +274,154 @@ class InMemoryExcelProcessor:
                 'records_imported': 0
             }
     
+    def _file_extension(self, filename: Optional[str]) -> str:
+        """Return the lowercased extension of an uploaded file name."""
+        if not filename or '.' not in filename:
+            return ''
+        return filename.rsplit('.', 1)[1].lower()
+    
+    def _spool_upload(self, file: FileStorage) -> tempfile.SpooledTemporaryFile:
+        """
+        Copy an upload into a spooled temporary file.
+        
+        Small uploads stay in memory, larger ones spill to disk, so a
+        multi-hundred-MB workbook is never duplicated into a bytes object.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_MEMORY)
+        shutil.copyfileobj(file.stream, spool)
+        file.seek(0)  # Reset file pointer for future reads
+        spool.seek(0)
+        return spool
+    
+    def _iter_worksheets(self, file_buffer, extension: str = 'xlsx'):
+        """
+        Yield (sheet_name, load_rows, count_rows) for every worksheet.
+        
+        load_rows() returns the sheet's rows as tuples with None for blank
+        cells; count_rows() returns the row count recorded in the sheet's
+        dimensions, header included, or None when it is unknown.
+        
+        The Rust-based calamine reader handles every format when it is
+        installed. Otherwise each extension goes to the reader registered in
+        _ENGINE_BY_EXTENSION: openpyxl in read-only mode, which never
+        materialises Cell objects, or pandas with xlrd/pyxlsb.
+        """
+        if CalamineWorkbook is not None:
+            workbook = CalamineWorkbook.from_filelike(file_buffer)
+            # get_sheet_by_name parses the whole sheet, so the sheet being
+            # read is kept for both its rows and its height
+            current_sheet = {}
+            
+            def load_sheet(name):
+                if name not in current_sheet:
+                    current_sheet.clear()
+                    current_sheet[name] = workbook.get_sheet_by_name(name)
+                return current_sheet[name]
+            
+            for sheet_name in workbook.sheet_names:
+                yield (sheet_name,
+                       lambda name=sheet_name: _calamine_rows(load_sheet(name)),
+                       lambda name=sheet_name: load_sheet(name).height)
+            return
+        
+        engine = _ENGINE_BY_EXTENSION.get(extension, 'openpyxl')
+        if engine != 'openpyxl':
+            import pandas as pd
+            
+            excel_file = pd.ExcelFile(file_buffer, engine=engine)
+            try:
+                for sheet_name in excel_file.sheet_names:
+                    yield (sheet_name,
+                           lambda name=sheet_name: _pandas_sheet_rows(excel_file, name),
+                           lambda: None)
+            finally:
+                excel_file.close()
+            return
+        
+        import openpyxl
+        
+        workbook = openpyxl.load_workbook(file_buffer, read_only=True, data_only=True)
+        try:
+            for sheet_name in workbook.sheetnames:
+                yield (sheet_name,
+                       lambda name=sheet_name: workbook[name].iter_rows(values_only=True),
+                       lambda name=sheet_name: workbook[name].max_row)
+        finally:
+            # Release the underlying ZIP handles held by read-only mode
+            workbook.close()
+    
+    def _read_sheet_fast(self, file_buffer, sheet_name: str,
+                         extension: str = 'xlsx') -> pd.DataFrame:
+        """
+        Read a worksheet into a DataFrame by streaming its rows.
+        
+        Much faster and lighter than pd.read_excel on large sheets, which
+        builds the full formatted workbook first.
+        """
+        import pandas as pd
+        
+        for name, load_rows, _ in self._iter_worksheets(file_buffer, extension):
+            if name != sheet_name:
+                continue
+            
+            rows = iter(load_rows())
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            
+            # Name blank and repeated headers the same way pandas does
+            columns = []
+            seen = {}
+            for index, value in enumerate(header):
+                name = str(value) if value is not None else f'Unnamed: {index}'
+                if name in seen:
+                    seen[name] += 1
+                    name = f'{name}.{seen[name]}'
+                else:
+                    seen[name] = 0
+                columns.append(name)
+            
+            return pd.DataFrame.from_records(rows, columns=columns)
+        
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean the dataframe for database insertion."""
+        import pandas as pd
+        
         # Remove completely empty rows and columns
         df = df.dropna(how='all').dropna(axis=1, how='all')
         
         # Clean column names
-        df.columns = [self._sanitize_column_name(str(col)) for col in df.columns]
+        df.columns = self._sanitize_column_names(df.columns)
         
-        # Handle datetime conversion safely
-        for col in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[col]):
-                df[col] = df[col].apply(self._safe_datetime_convert)
+        # Parse text columns that hold ISO dates with a single vectorised call
+        for col in df.select_dtypes(include='object').columns:
+            parsed = self._parse_iso_date_column(df[col])
+            if parsed is not None:
+                df[col] = parsed
+        
+        # Handle datetime conversion safely: replace NaT with None for all
+        # datetime columns at once instead of calling back into Python per cell
+        datetime_cols = df.select_dtypes(include=['datetime', 'datetimetz']).columns
+        if len(datetime_cols) > 0:
+            datetime_values = df[datetime_cols]
+            df[datetime_cols] = datetime_values.astype(object).where(datetime_values.notna(), None)
         
         return df
     
+    def _replace_non_ascii_word_chars(self, name: str) -> str:
+        """Replace every character outside [A-Za-z0-9_] with an underscore."""
+        # ASCII names are sanitized with one str.translate pass; the regex is
+        # only needed when a header contains non-ASCII characters
+        if name.isascii():
+            return name.translate(ASCII_NON_WORD_TABLE)
+        return _NON_ASCII_WORD_PATTERN.sub('_', name)
+    
     def _sanitize_table_name(self, name: str) -> str:
         """Sanitize table name for database."""
-        import re
         # Remove special characters and spaces, keep only alphanumeric and underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', str(name))
+        sanitized = self._replace_non_ascii_word_chars(str(name))
         # Ensure it starts with a letter
         if not sanitized[0].isalpha():
             sanitized = 'table_' + sanitized
@@ -201,11 +429,11 @@ class InMemoryExcelProcessor:
     
     def _sanitize_column_name(self, name: str) -> str:
         """Sanitize column name for database."""
-        import re
         # Remove special characters and spaces, replace with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', str(name))
+        sanitized = self._replace_non_ascii_word_chars(str(name))
         # Remove multiple consecutive underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
+        while '__' in sanitized:
+            sanitized = sanitized.replace('__', '_')
         # Remove leading/trailing underscores
         sanitized = sanitized.strip('_')
         # Ensure it starts with a letter
@@ -213,6 +441,54 @@ class InMemoryExcelProcessor:
             sanitized = 'col_' + sanitized
         return sanitized.lower()
     
+    def _parse_iso_date_column(self, series: pd.Series) -> Optional[pd.Series]:
+        """
+        Convert a text column to datetimes when it holds ISO formatted dates.
+        
+        A compiled regex over a small sample rejects most columns before
+        pandas' date parser runs. Returns None when the column is left as is.
+        """
+        import pandas as pd
+        
+        sample = series.dropna().head(_DATE_SAMPLE_SIZE)
+        if sample.empty or not sample.astype(str).str.match(_ISO_DATE_PATTERN).all():
+            return None
+        
+        try:
+            parsed = pd.to_datetime(series, format='ISO8601', errors='coerce', cache=True)
+        except (ValueError, TypeError):
+            # e.g. mixed UTC offsets; leave every value to the fallback below
+            parsed = pd.Series(pd.NaT, index=series.index)
+        
+        failed = parsed.isna() & series.notna()
+        if failed.any():
+            # Values pandas could not parse get one more try with ciso8601
+            if ciso8601 is None:
+                return None
+            fallback = series[failed].map(_parse_iso_datetime)
+            # Keep the original text if any value still failed to parse
+            if fallback.isna().any():
+                return None
+            parsed = parsed.astype(object)
+            parsed[failed] = fallback
+        return parsed
+    
+    def _sanitize_column_names(self, columns: pd.Index) -> List[str]:
+        """Sanitize all column headers at once with vectorised string ops."""
+        import pandas as pd
+        
+        names = (
+            pd.Index(columns).astype(str)
+            .str.replace(_NON_ASCII_WORD_PATTERN, '_', regex=True)
+            .str.replace(_UNDERSCORE_RUN_PATTERN, '_', regex=True)
+            .str.strip('_')
+        )
+        # Ensure each name starts with a letter, matching _sanitize_column_name
+        return [
+            name.lower() if name and name[0].isalpha() else f'col_{name}'.lower()
+            for name in names
+        ]
+    
     def _create_new_table(self, df: pd.DataFrame, table_name: str, 
                          sheet_name: str, filename: str) -> bool:
         """Create a new table with the dataframe data."""
@@ -221,19 +497,32 @@ class InMemoryExcelProcessor:
             metadata = MetaData()
             columns = [Column('id', Integer, primary_key=True, autoincrement=True)]
             
+            column_types = self._infer_column_types(df)
             for col_name in df.columns:
-                col_type = self._infer_column_type(df[col_name])
-                columns.append(Column(col_name, col_type))
+                columns.append(Column(col_name, column_types[col_name]))
             
             table = Table(table_name, metadata, *columns)
             
-            # Create the table in database
-            table.create(self.db.engine, checkfirst=True)
-            
-            # Insert data
-            data_dicts = df.to_dict('records')
-            if data_dicts:
-                self.db.session.execute(table.insert().values(data_dicts))
+            # Create the table and insert data with Core, leaving the ORM
+            # session for the metadata record only
+            table_created = False
+            try:
+                with self.db.engine.begin() as connection:
+                    table_created = not inspect(connection).has_table(table_name)
+                    table.create(connection, checkfirst=True)
+                    # Without ADBC the data goes in the same transaction as the DDL
+                    if not self._adbc_supported():
+                        self._bulk_load(connection, table, df)
+                if self._adbc_supported():
+                    self._load_table(table, df)
+            except Exception:
+                if table_created:
+                    # Don't leave an empty table without a TableMetadata
+                    # row behind for the next upload to trip over
+                    self._drop_table(table)
+                raise
+            # Drop any reflection cached for a previous table of this name
+            self._table_cache.pop(table_name, None)
             
             # Create metadata record
             metadata_record = TableMetadata(
@@ -255,21 +544,22 @@ class InMemoryExcelProcessor:
             print(f"Error creating new table: {str(e)}")
             return False
     
+    def _drop_table(self, table: Table) -> None:
+        """Drop a table created by a failed import, logging rather than raising."""
+        try:
+            table.drop(self.db.engine, checkfirst=True)
+        except SQLAlchemyError as e:
+            print(f"Error dropping table {table.name}: {str(e)}")
+        self._table_cache.pop(table.name, None)
+    
     def _replace_table_data(self, df: pd.DataFrame, table_name: str, sheet_name: str) -> bool:
         """Replace data in existing table."""
         try:
-            # Clear existing data
-            self.db.session.execute(f"DELETE FROM {table_name}")
+            # Get table object
+            table = self._get_table(table_name)
             
-            # Insert new data
-            data_dicts = df.to_dict('records')
-            if data_dicts:
-                # Get table object
-                metadata = MetaData()
-                metadata.reflect(bind=self.db.engine)
-                table = metadata.tables[table_name]
-                
-                self.db.session.execute(table.insert().values(data_dicts))
+            # Clear existing data and insert new data in one transaction
+            self._load_table(table, df, clear=True)
             
             # Update metadata
             metadata_record = TableMetadata.query.filter_by(table_name=table_name).first()
@@ -285,18 +575,113 @@ class InMemoryExcelProcessor:
             print(f"Error replacing table data: {str(e)}")
             return False
     
+    def _get_table(self, table_name: str) -> Table:
+        """Return the reflected Table for table_name, reflecting it only once."""
+        table = self._table_cache.get(table_name)
+        if table is None:
+            # Reflect only the target table rather than the whole schema
+            table = Table(table_name, MetaData(), autoload_with=self.db.engine)
+            self._table_cache[table_name] = table
+        return table
+    
+    def _clear_table(self, connection, table_name: str) -> None:
+        """
+        Remove every row from a table inside the connection's transaction.
+        
+        PostgreSQL uses TRUNCATE, which releases the table's pages instead of
+        deleting and logging each row; other dialects fall back to DELETE.
+        """
+        connection.execute(text(self._clear_table_sql(connection.dialect, table_name)))
+    
+    def _clear_table_sql(self, dialect, table_name: str) -> str:
+        """Return the statement that empties table_name for the given dialect."""
+        quoted_name = dialect.identifier_preparer.quote(table_name)
+        if dialect.name == 'postgresql':
+            return f"TRUNCATE TABLE {quoted_name}"
+        return f"DELETE FROM {quoted_name}"
+    
+    def _adbc_supported(self) -> bool:
+        """Check whether pyarrow and an ADBC driver for the database are installed."""
+        return self._adbc_driver() is not None
+    
+    def _adbc_driver(self):
+        """
+        Return the ADBC DBAPI module for the configured database, if installed.
+        
+        Only PostgreSQL is ingested through ADBC. The SQLite driver bundles
+        its own copy of the SQLite library, and two copies writing the same
+        WAL-mode file from one process corrupt it.
+        """
+        if self.db.engine.dialect.name != 'postgresql':
+            return None
+        try:
+            import pyarrow  # needed to build the Arrow table
+            import adbc_driver_postgresql.dbapi as adbc_dbapi
+        except ImportError:
+            return None
+        return adbc_dbapi
+    
+    def _load_table(self, table: Table, df: pd.DataFrame, clear: bool = False) -> None:
+        """
+        Load a dataframe into an existing table, optionally emptying it first.
+        
+        ADBC is tried first when it is installed; a frame Arrow cannot
+        convert, or an ingest the driver rejects, is loaded with _bulk_load
+        instead. The optional clear and the load run in one transaction
+        either way.
+        """
+        if self._adbc_supported() and self._adbc_ingest(table, df, clear=clear):
+            return
+        
+        with self.db.engine.begin() as connection:
+            if clear:
+                self._clear_table(connection, table.name)
+            self._bulk_load(connection, table, df)
+    
+    def _adbc_ingest(self, table: Table, df: pd.DataFrame, clear: bool = False) -> bool:
+        """
+        Ingest a dataframe as an Arrow table through ADBC.
+        
+        Columns are sent as Arrow record batches rather than as per-row
+        Python parameters. The optional clear and the ingest run in one ADBC
+        transaction. Returns False, with nothing committed, when the frame
+        cannot be converted to Arrow or the driver rejects the ingest.
+        """
+        import pyarrow as pa
+        
+        adbc_dbapi = self._adbc_driver()
+        # ADBC expects a plain libpq URI without the SQLAlchemy driver suffix
+        uri = self.db.engine.url.set(drivername='postgresql').render_as_string(hide_password=False)
+        
+        try:
+            arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Object columns mixing numbers and text such as "N/A" have no
+            # single Arrow type; executemany accepts them as they are
+            return False
+        
+        try:
+            # Closing without commit rolls the clear back as well
+            with adbc_dbapi.connect(uri) as connection:
+                with connection.cursor() as cursor:
+                    if clear:
+                        cursor.execute(self._clear_table_sql(self.db.engine.dialect, table.name))
+                    if arrow_table.num_rows:
+                        cursor.adbc_ingest(table.name, arrow_table, mode='append')
+                connection.commit()
+        except adbc_dbapi.Error as e:
+            print(f"ADBC ingest into {table.name} failed, using bulk insert: {str(e)}")
+            return False
+        return True
+    
     def _append_to_table(self, df: pd.DataFrame, table_name: str, sheet_name: str) -> bool:
         """Append data to existing table."""
         try:
             # Get table object
-            metadata = MetaData()
-            metadata.reflect(bind=self.db.engine)
-            table = metadata.tables[table_name]
+            table = self._get_table(table_name)
             
-            # Insert new data
-            data_dicts = df.to_dict('records')
-            if data_dicts:
-                self.db.session.execute(table.insert().values(data_dicts))
+            # Insert new data in one transaction
+            self._load_table(table, df)
             
             # Update metadata
             metadata_record = TableMetadata.query.filter_by(table_name=table_name).first()
@@ -312,37 +697,156 @@ class InMemoryExcelProcessor:
             print(f"Error appending to table: {str(e)}")
             return False
     
-    def _infer_column_type(self, series: pd.Series):
-        """Infer the best SQLAlchemy column type for a pandas series."""
-        from sqlalchemy import Integer, Float, DateTime, String, Text
-        
-        # Remove null values for type inference
-        non_null_series = series.dropna()
+    def _bulk_load(self, connection, table: Table, df: pd.DataFrame) -> None:
+        """
+        Load a dataframe into a table using the fastest path for the dialect.
         
-        if len(non_null_series) == 0:
-            return Text
+        Large PostgreSQL imports are streamed through COPY FROM STDIN and
+        smaller ones sent with psycopg2's execute_values, both of which
+        bypass per-row parameter binding; other dialects go through chunked
+        executemany.
+        """
+        if df.empty:
+            return
         
-        # Check if it's numeric
-        if pd.api.types.is_numeric_dtype(non_null_series):
-            if pd.api.types.is_integer_dtype(non_null_series):
-                return Integer
+        if connection.dialect.name == 'postgresql':
+            if len(df) >= _COPY_THRESHOLD_ROWS:
+                self._copy_into_postgres(connection, table, df)
             else:
-                return Float
+                self._execute_values_into_postgres(connection, table, df)
+        else:
+            self._bulk_insert(connection, table, df)
+    
+    def _copy_into_postgres(self, connection, table: Table, df: pd.DataFrame) -> None:
+        """Stream a dataframe into a PostgreSQL table with COPY FROM STDIN."""
+        preparer = connection.dialect.identifier_preparer
+        column_list = ', '.join(preparer.quote(str(col)) for col in df.columns)
         
-        # Check if it's datetime
-        if pd.api.types.is_datetime64_any_dtype(non_null_series):
-            return DateTime
+        buffer = io.StringIO()
+        df.to_csv(buffer, index=False, header=False, na_rep='\\N')
+        buffer.seek(0)
         
-        # Check string length to decide between String and Text
-        if pd.api.types.is_string_dtype(non_null_series):
-            max_length = non_null_series.astype(str).str.len().max()
-            if max_length <= 255:
-                return String(255)
+        # Use the connection's own DBAPI connection so COPY joins its transaction
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {preparer.format_table(table)} ({column_list}) "
+                f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buffer
+            )
+        finally:
+            cursor.close()
+    
+    def _execute_values_into_postgres(self, connection, table: Table, df: pd.DataFrame,
+                                      page_size: int = 1000) -> None:
+        """
+        Insert dataframe rows into PostgreSQL with psycopg2's execute_values.
+        
+        Each page becomes a single INSERT ... VALUES (...), (...) statement
+        built by psycopg2 instead of one bound statement per row.
+        """
+        from psycopg2.extras import execute_values
+        
+        preparer = connection.dialect.identifier_preparer
+        column_list = ', '.join(preparer.quote(str(col)) for col in df.columns)
+        
+        # Use the connection's own DBAPI connection so the insert joins its transaction
+        cursor = connection.connection.cursor()
+        try:
+            execute_values(
+                cursor,
+                f"INSERT INTO {preparer.format_table(table)} ({column_list}) VALUES %s",
+                df.itertuples(index=False, name=None),
+                page_size=page_size
+            )
+        finally:
+            cursor.close()
+    
+    def _bulk_insert(self, connection, table: Table, df: pd.DataFrame,
+                     chunk_size: int = 1000) -> None:
+        """
+        Insert dataframe rows in fixed-size chunks using Core executemany.
+        
+        A single multi-row VALUES clause for the whole sheet builds one huge
+        statement in memory; chunked executemany keeps peak memory at one
+        chunk and skips the ORM unit of work. Rows are read as plain tuples
+        so the whole frame is never materialised as a list of dicts.
+        """
+        if df.empty:
+            return
+        
+        insert_stmt = table.insert()
+        columns = [str(col) for col in df.columns]
+        rows = df.itertuples(index=False, name=None)
+        while True:
+            params = [dict(zip(columns, row)) for row in itertools.islice(rows, chunk_size)]
+            if not params:
+                break
+            connection.execute(insert_stmt, params)
+    
+    def _infer_column_types(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Infer the best SQLAlchemy column type for every dataframe column.
+        
+        Dtypes and non-null counts are read once for the whole frame and the
+        string lengths of all text columns are measured together, instead of
+        dropping nulls and dispatching type checks column by column.
+        """
+        import pandas as pd
+        
+        dtypes = df.dtypes
+        non_null_counts = df.count()
+        column_types = {}
+        string_cols = []
+        
+        for col in df.columns:
+            dtype = dtypes[col]
+            
+            if non_null_counts[col] == 0:
+                column_types[col] = Text
+            # Check if it's numeric
+            elif pd.api.types.is_numeric_dtype(dtype):
+                column_types[col] = Integer if pd.api.types.is_integer_dtype(dtype) else Float
+            # Check if it's datetime
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                column_types[col] = DateTime
             else:
-                return Text
+                inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+                # _clean_dataframe leaves datetime columns as object dtype
+                # holding Timestamps and None
+                if inferred in ('datetime', 'datetime64', 'date'):
+                    column_types[col] = DateTime
+                # Columns holding only strings are sized below
+                elif inferred == 'string':
+                    string_cols.append(col)
+                # Default to Text for everything else
+                else:
+                    column_types[col] = Text
+        
+        # Check string length to decide between String and Text
+        for col in string_cols:
+            max_length = self._max_string_length(df[col])
+            column_types[col] = String(255) if max_length <= 255 else Text
+        
+        return column_types
+    
+    def _max_string_length(self, series: pd.Series) -> int:
+        """
+        Return the length of the longest string in a text column.
+        
+        Lengths are taken straight from the values rather than through
+        astype(str).str.len(), which allocates two whole new series first.
+        """
+        import pandas as pd
+        
+        dtype = series.dtype
+        if isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow':
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            
+            return pc.max(pc.utf8_length(pa.array(series.array))).as_py() or 0
         
-        # Default to Text for everything else
-        return Text
+        return max(map(len, series.dropna().to_numpy(dtype=object)), default=0)
     
     def get_existing_tables(self) -> List[Dict[str, Any]]:
         """Get list of existing tables from metadata."""
@@ -1,57 +1,256 @@
 from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import Table, text, inspect, desc, asc
 from sqlalchemy.exc import SQLAlchemyError
+from flask import current_app, g, has_request_context
 from models import db
 import pandas as pd
+import numpy as np
 import os
 import tempfile
 from openpyxl import Workbook
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill
 from datetime import datetime
-import numpy as np
 import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # Optional: without it only identical cleaned names match
+    fuzz = process = None
+
+try:
+    import orjson
+except ImportError:  # Optional: saved configurations fall back to the json module
+    orjson = None
+
+try:
+    import pyarrow
+except ImportError:  # Optional: text statistics fall back to Python str objects
+    pyarrow = None
+
+# YYYY-MM-DD, YYYY/MM/DD, MM/DD/YYYY or MM-DD-YYYY prefix; the backreferences
+# keep both separators of a value identical, as the individual patterns did
+_DATE_RE = re.compile(r'\d{4}([-/])\d{2}\1\d{2}|\d{2}([-/])\d{2}\2\d{4}')
+
+# Characters that need escaping or quoting when exported as CSV
+_EXPORT_SPECIAL_CHARS_RE = re.compile(r'[\n\r\t"\']')
+
+# Characters that make CSV output awkward for the export recommendations
+_CSV_SPECIAL_CHARS = frozenset('\n\r\t,"')
+
+# Statements a custom query may not contain; word boundaries keep column
+# names such as created_at or updated_by from matching
+_BANNED_KEYWORDS_RE = re.compile(r'\b(?:DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|EXEC|EXECUTE)\b', re.IGNORECASE)
+
+# Minimum RapidFuzz ratio (0-100) for two cleaned column names to count as similar
+_NAME_SIMILARITY_CUTOFF = 85
+
+# Below this many rows a set of row tuples finds duplicates faster than
+# pandas' vectorized row hashing, whose fixed overhead dominates small previews
+_TUPLE_DUPLICATE_MAX_ROWS = 2000
+
+# From this many cells on, analyze_table_data runs its per-table analyses in
+# worker threads; below it the thread start-up costs more than it saves
+_PARALLEL_ANALYSIS_MIN_CELLS = 100000
+
+# Rows analyze_table_data reads by default; larger tables are profiled from
+# their first rows, in table order so the trend analysis still applies
+_ANALYSIS_SAMPLE_ROWS = 100000
+
+# Finished table analyses kept at most; each holds sample rows and the
+# correlation matrix, so the least recently used are evicted beyond this
+_ANALYSIS_CACHE_SIZE = 64
+
+# Full join result null counts kept at most; every distinct filter value or
+# limit is a separate preview, so the least recently used are evicted
+_COMPLETENESS_CACHE_SIZE = 128
+
+# Join column statistics kept at most, one per table and column set
+_TABLE_STATS_CACHE_SIZE = 256
+
+# Two whitespace-separated words, i.e. value.split() yields more than one token
+_MULTI_WORD_RE = re.compile(r'\S\s+\S')
+
+# SQL keywords a join configuration may place in the generated query;
+# identifiers are quoted and values bound, so these are the only raw parts
+_COMPARISON_OPERATORS = frozenset({'=', '!=', '<>', '<', '>', '<=', '>='})
+_FILTER_OPERATORS = _COMPARISON_OPERATORS | {
+    'LIKE', 'NOT LIKE', 'STARTS_WITH', 'ENDS_WITH', 'BETWEEN', 'NOT BETWEEN', 'IS NULL', 'IS NOT NULL'
+}
+_JOIN_TYPES = frozenset({'INNER', 'LEFT', 'LEFT OUTER', 'RIGHT', 'RIGHT OUTER', 'FULL', 'FULL OUTER'})
+
+# Column type labels of the table analysis, keyed by NumPy dtype kind
+_DTYPE_KIND_NAMES = {'i': 'Numeric', 'f': 'Numeric', 'O': 'Text', 'M': 'Date/Time', 'b': 'Boolean'}
+
+# Names accepted for tables created from query results
+_TABLE_NAME_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Statements of the saved-configuration store, built once at import; the
+# sqlite3 ones are reused from the connection's prepared-statement cache
+_SQL_CREATE_CONFIGURATIONS = '''
+    CREATE TABLE IF NOT EXISTS relationship_configurations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        configuration TEXT NOT NULL,
+        created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+_SQL_UPDATE_CONFIGURATION = '''
+    UPDATE relationship_configurations 
+    SET configuration = ?, updated_date = CURRENT_TIMESTAMP 
+    WHERE name = ?
+'''
+_SQL_INSERT_CONFIGURATION = '''
+    INSERT INTO relationship_configurations (name, configuration) 
+    VALUES (?, ?)
+'''
+_SQL_LOAD_CONFIGURATION = text("SELECT configuration FROM relationship_configurations WHERE name = :name")
+_SQL_LIST_CONFIGURATIONS = text('''
+    SELECT name, created_date, updated_date 
+    FROM relationship_configurations 
+    ORDER BY updated_date DESC
+''')
+_SQL_DELETE_CONFIGURATION = text("DELETE FROM relationship_configurations WHERE name = :name")
+
+# Direct SQLite connections for custom queries, one per thread and database
+# file; sqlite3 connections may not be shared across threads
+_sqlite_connections = threading.local()
+
+
+def _sqlite_file_identity(db_path: str) -> Optional[Tuple[int, int]]:
+    """Return the (st_dev, st_ino) of a database file, or None if it does not exist."""
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def _get_sqlite_connection(db_path: str) -> sqlite3.Connection:
+    """Return this thread's open connection to ``db_path``, creating it on first use.
+    
+    The cached connection is checked against the file's device and inode on
+    every call, so a database deleted and recreated under the same name gets
+    a new connection rather than one still using the unlinked file.
+    """
+    connections = getattr(_sqlite_connections, 'connections', None)
+    if connections is None:
+        connections = _sqlite_connections.connections = {}
+    
+    identity = _sqlite_file_identity(db_path)
+    cached = connections.get(db_path)
+    if cached is not None:
+        conn, cached_identity = cached
+        if identity is not None and identity == cached_identity:
+            return conn
+        conn.close()
+    
+    conn = sqlite3.connect(db_path)
+    # Same settings the application engine applies to its connections
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=134217728")
+    conn.execute("PRAGMA cache_size=-65536")
+    connections[db_path] = (conn, _sqlite_file_identity(db_path))
+    return conn
+
 
 class RelationshipService:
     """Service for managing table relationships and joins."""
     
     def __init__(self):
         """Initialize the relationship service."""
-        pass
-    
-    def _convert_numpy_types(self, obj):
-        """Convert numpy types to Python native types for JSON serialization."""
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, dict):
-            return {key: self._convert_numpy_types(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_numpy_types(item) for item in obj]
-        else:
-            return obj
+        # Column metadata keyed on (table_name, database); cleared per request
+        # and after DDL through invalidate_schema_cache()
+        self._col_cache = {}
+        # Full-result null counts keyed on the join SQL, kept for a short
+        # while in least recently used order
+        self._completeness_cache = OrderedDict()
+        # Row and distinct-value counts of join columns, keyed on the table
+        # and the counted columns, with the same lifetime and bounding
+        self._table_stats_cache = OrderedDict()
+        self._cache_timeout = 300  # 5 minutes
+        # Guards the bounded result caches shared by request threads
+        self._result_cache_lock = threading.Lock()
+        # SELECT ... FROM ... JOIN templates keyed on the configuration's
+        # shape; they embed column lists, so they go with the schema cache
+        self._join_template_cache = {}
+        # Database files, as (path, (st_dev, st_ino)), whose
+        # relationship_configurations table is known to exist
+        self._configuration_tables = set()
+        # Finished table analyses keyed on (database, table_name), each kept
+        # with the row count and file stamps it was computed from, in least
+        # recently used order; shared by request threads, hence the lock
+        self._analysis_cache = OrderedDict()
+        self._analysis_cache_lock = threading.Lock()
+    
+    def invalidate_schema_cache(self):
+        """Drop cached column metadata so schema changes are picked up."""
+        self._col_cache.clear()
+        self._join_template_cache.clear()
+        if has_request_context():
+            g.pop('relationship_tables', None)
+            g.pop('relationship_inspector', None)
+    
+    def _inspector(self):
+        """Return a schema inspector for the default database, shared within a request.
+        
+        The inspector memoizes its reflection queries, so one instance per
+        request avoids repeating them for every table that is looked up.
+        """
+        if not has_request_context():
+            return inspect(db.engine)
+        if 'relationship_inspector' not in g:
+            g.relationship_inspector = inspect(db.engine)
+        return g.relationship_inspector
+    
+    def _existing_tables(self) -> set:
+        """Return the default database's table names, read once per request."""
+        if not has_request_context():
+            return set(self._inspector().get_table_names())
+        if 'relationship_tables' not in g:
+            g.relationship_tables = set(self._inspector().get_table_names())
+        return g.relationship_tables
     
     def get_table_columns(self, table_name: str, database: str = 'excel_data') -> List[Dict[str, Any]]:
         """Get columns for a specific table with their data types."""
+        cache_key = (table_name, database)
+        columns = self._col_cache.get(cache_key)
+        if columns is None:
+            columns = self._load_table_columns(table_name, database)
+            # Missing tables are not cached so a table created later is found
+            if columns:
+                self._col_cache[cache_key] = columns
+        return columns
+    
+    def _load_table_columns(self, table_name: str, database: str) -> List[Dict[str, Any]]:
+        """Reflect the columns of a table from the requested database."""
         try:
             if database and database != 'excel_data':
-                # Connect to specific database
-                import sqlite3
+                # Connect to specific database through the thread's cached connection
                 db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', f'{database}.db')
                 
                 if not os.path.exists(db_path):
                     return []
                 
-                conn = sqlite3.connect(db_path)
-                cursor = conn.cursor()
+                cursor = _get_sqlite_connection(db_path).cursor()
                 
                 # Check if table exists
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
                 if not cursor.fetchone():
-                    conn.close()
+                    cursor.close()
                     return []
                 
                 # Get column info from sqlite
@@ -68,15 +267,14 @@ class RelationshipService:
                     for col in columns_info
                 ]
                 
-                conn.close()
+                cursor.close()
                 return columns
             else:
                 # Use default database connection
-                inspector = inspect(db.engine)
-                if table_name not in inspector.get_table_names():
+                if table_name not in self._existing_tables():
                     return []
                 
-                columns = inspector.get_columns(table_name)
+                columns = self._inspector().get_columns(table_name)
                 return [
                     {
                         'name': col['name'],
@@ -97,82 +295,127 @@ class RelationshipService:
         if len(tables) < 2:
             return relationships
         
-        # Get column information for all tables
+        # Get column information for all tables, normalizing each name once
         table_columns = {}
         for table in tables:
-            table_columns[table] = self.get_table_columns(table)
-        
-        # Compare each pair of tables
-        for i, table1 in enumerate(tables):
-            for table2 in tables[i+1:]:
-                cols1 = table_columns[table1]
-                cols2 = table_columns[table2]
+            table_columns[table] = [self._with_normalized_name(col) for col in self.get_table_columns(table)]
+        
+        # Index every column by normalized name across all tables, keeping
+        # 'id' and '*_id' columns aside for the ID pattern match
+        name_index = defaultdict(list)
+        id_columns = []
+        foreign_key_columns = []
+        for t, table in enumerate(tables):
+            for c, col in enumerate(table_columns[table]):
+                name_index[col['_clean']].append((t, c))
+                if col['_lower'] == 'id':
+                    id_columns.append((t, c))
+                elif col['_lower'].endswith('_id'):
+                    foreign_key_columns.append((t, c))
+        
+        # Only columns sharing a bucket can match, so pair those up instead
+        # of comparing every column of every table pair
+        candidates = set()
+        
+        def add_pairs(group1, group2):
+            for entry1 in group1:
+                for entry2 in group2:
+                    if entry1[0] < entry2[0]:
+                        candidates.add((entry1[0], entry2[0], entry1[1], entry2[1]))
+                    elif entry2[0] < entry1[0]:
+                        candidates.add((entry2[0], entry1[0], entry2[1], entry1[1]))
+        
+        for entries in name_index.values():
+            if len(entries) > 1:
+                add_pairs(entries, entries)
+        add_pairs(id_columns, foreign_key_columns)
+        
+        # Near-miss names need a similarity score, so score each table pair's
+        # cleaned names in one vectorized cdist call
+        if process is not None:
+            clean_names = [[col['_clean'] for col in table_columns[table]] for table in tables]
+            for t1 in range(len(tables)):
+                for t2 in range(t1 + 1, len(tables)):
+                    if not clean_names[t1] or not clean_names[t2]:
+                        continue
+                    scores = process.cdist(clean_names[t1], clean_names[t2], scorer=fuzz.ratio,
+                                           score_cutoff=_NAME_SIMILARITY_CUTOFF)
+                    for c1, c2 in zip(*scores.nonzero()):
+                        candidates.add((t1, t2, int(c1), int(c2)))
+        
+        # Emit in table-pair then column order, as a full pairwise scan would
+        for t1, t2, c1, c2 in sorted(candidates):
+            table1, table2 = tables[t1], tables[t2]
+            col1 = table_columns[table1][c1]
+            col2 = table_columns[table2][c2]
+            if self._columns_compatible(col1, col2):
+                confidence = self._calculate_confidence(col1, col2)
                 
-                # Find matching column names and compatible types
-                for col1 in cols1:
-                    for col2 in cols2:
-                        if self._columns_compatible(col1, col2):
-                            confidence = self._calculate_confidence(col1, col2)
-                            
-                            relationships.append({
-                                'table1': table1,
-                                'column1': col1['name'],
-                                'table2': table2,
-                                'column2': col2['name'],
-                                'type1': col1['type'],
-                                'type2': col2['type'],
-                                'confidence': confidence,
-                                'suggested_join': 'INNER' if confidence > 0.8 else 'LEFT'
-                            })
+                relationships.append({
+                    'table1': table1,
+                    'column1': col1['name'],
+                    'table2': table2,
+                    'column2': col2['name'],
+                    'type1': col1['type'],
+                    'type2': col2['type'],
+                    'confidence': confidence,
+                    'suggested_join': 'INNER' if confidence > 0.8 else 'LEFT'
+                })
         
         # Sort by confidence (highest first)
         relationships.sort(key=lambda x: x['confidence'], reverse=True)
         return relationships
     
+    def _with_normalized_name(self, col: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a column dict, adding the lowercased and separator-free name."""
+        lower = col['name'].lower()
+        return dict(col, _lower=lower, _clean=lower.replace('_', '').replace(' ', ''))
+    
+    def _name_similarity(self, col1: Dict[str, Any], col2: Dict[str, Any]) -> float:
+        """Score cleaned column names from 0 to 100; scores under the cutoff are 0."""
+        if col1['_clean'] == col2['_clean']:
+            return 100.0
+        if fuzz is None:
+            return 0.0
+        return fuzz.ratio(col1['_clean'], col2['_clean'], score_cutoff=_NAME_SIMILARITY_CUTOFF)
+    
     def _columns_compatible(self, col1: Dict[str, Any], col2: Dict[str, Any]) -> bool:
-        """Check if two columns are compatible for joining."""
+        """Check if two columns are compatible for joining.
+        
+        Both columns must carry the names added by _with_normalized_name.
+        """
+        name1, name2 = col1['_lower'], col2['_lower']
+        
         # Exact name match
-        if col1['name'].lower() == col2['name'].lower():
+        if name1 == name2:
             return True
         
         # Common ID patterns
-        id_patterns = [
-            (col1['name'].lower().endswith('_id') and col2['name'].lower() == 'id'),
-            (col2['name'].lower().endswith('_id') and col1['name'].lower() == 'id'),
-            (col1['name'].lower() == 'id' and col2['name'].lower() == 'id'),
-        ]
-        
-        if any(id_patterns):
+        if (name1.endswith('_id') and name2 == 'id') or (name2.endswith('_id') and name1 == 'id'):
             return True
         
         # Similar names (fuzzy matching)
-        name1_clean = col1['name'].lower().replace('_', '').replace(' ', '')
-        name2_clean = col2['name'].lower().replace('_', '').replace(' ', '')
-        
-        if name1_clean == name2_clean:
-            return True
-        
-        return False
+        return self._name_similarity(col1, col2) >= _NAME_SIMILARITY_CUTOFF
     
     def _calculate_confidence(self, col1: Dict[str, Any], col2: Dict[str, Any]) -> float:
         """Calculate confidence score for a potential relationship."""
         confidence = 0.0
+        name1, name2 = col1['_lower'], col2['_lower']
         
         # Exact name match gets highest score
-        if col1['name'].lower() == col2['name'].lower():
+        if name1 == name2:
             confidence += 0.9
         
         # ID patterns get high scores
-        if col1['name'].lower() == 'id' or col2['name'].lower() == 'id':
+        if name1 == 'id' or name2 == 'id':
             confidence += 0.8
-        elif '_id' in col1['name'].lower() or '_id' in col2['name'].lower():
+        elif '_id' in name1 or '_id' in name2:
             confidence += 0.7
         
-        # Similar names
-        name1_clean = col1['name'].lower().replace('_', '').replace(' ', '')
-        name2_clean = col2['name'].lower().replace('_', '').replace(' ', '')
-        if name1_clean == name2_clean:
-            confidence += 0.6
+        # Similar names, scaled by how close the cleaned names are
+        similarity = self._name_similarity(col1, col2)
+        if similarity:
+            confidence += 0.6 * similarity / 100
         
         # Both primary keys is less likely to be a good relationship
         if col1.get('primary_key') and col2.get('primary_key'):
@@ -194,8 +437,7 @@ class RelationshipService:
             return {'valid': False, 'errors': errors, 'warnings': warnings}
         
         # Validate tables exist
-        inspector = inspect(db.engine)
-        existing_tables = inspector.get_table_names()
+        existing_tables = self._existing_tables()
         
         for table in tables:
             if table not in existing_tables:
@@ -209,7 +451,8 @@ class RelationshipService:
         if len(tables) > 1 and not joins:
             errors.append("Multiple tables selected but no joins defined")
         
-        # Validate joins
+        # Validate joins; column names are resolved once per table
+        column_names = {}
         for i, join in enumerate(joins):
             table1 = join.get('table1')
             table2 = join.get('table2')
@@ -230,12 +473,12 @@ class RelationshipService:
             
             # Check columns exist
             if table1 in existing_tables:
-                cols1 = [col['name'] for col in self.get_table_columns(table1)]
+                cols1 = self._column_names(table1, column_names)
                 if column1 not in cols1:
                     errors.append(f"Join {i+1}: Column '{column1}' not found in table '{table1}'")
             
             if table2 in existing_tables:
-                cols2 = [col['name'] for col in self.get_table_columns(table2)]
+                cols2 = self._column_names(table2, column_names)
                 if column2 not in cols2:
                     errors.append(f"Join {i+1}: Column '{column2}' not found in table '{table2}'")
             
@@ -254,6 +497,12 @@ class RelationshipService:
             'warnings': warnings
         }
     
+    def _column_names(self, table: str, column_names: Dict[str, set]) -> set:
+        """Return the column names of a table, memoized in ``column_names``."""
+        if table not in column_names:
+            column_names[table] = {col['name'] for col in self.get_table_columns(table)}
+        return column_names[table]
+    
     def preview_joined_data(self, config: Dict[str, Any], limit: int = 100) -> Dict[str, Any]:
         """Generate a comprehensive preview of the joined data based on configuration."""
         try:
@@ -265,22 +514,18 @@ class RelationshipService:
                     'details': validation['errors']
                 }
             
-            query = self._build_join_query(config, limit=limit)
+            query, params = self._build_join_query(config, limit=limit)
             
-            result = db.session.execute(text(query))
-            columns = result.keys()
-            rows = result.fetchall()
+            result = db.session.execute(text(query), params)
+            columns = list(result.keys())
             
-            # Convert to list of dictionaries
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    row_dict[columns[i]] = value
-                data.append(row_dict)
+            # Load the rows column-wise; object dtype keeps the driver's values
+            # (ints stay ints and NULL stays None) for the JSON response
+            preview_df = pd.DataFrame(result.fetchall(), columns=columns, dtype=object)
+            data = preview_df.to_dict('records')
             
             # Get comprehensive preview analysis
-            preview_analysis = self._generate_comprehensive_preview_analysis(config, data, query)
+            preview_analysis = self._generate_comprehensive_preview_analysis(config, data, query, preview_df)
             
             return {
                 'success': True,
@@ -303,18 +548,33 @@ class RelationshipService:
                 'error': str(e)
             }
     
-    def _generate_comprehensive_preview_analysis(self, config: Dict[str, Any], preview_data: List[Dict], query: str) -> Dict[str, Any]:
+    def _generate_comprehensive_preview_analysis(self, config: Dict[str, Any], preview_data: List[Dict], query: str,
+                                                 preview_df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Generate comprehensive analysis of the preview data for enhanced output visualization."""
         try:
-            analysis = {
-                'statistics': self._get_enhanced_preview_statistics(config, preview_data),
-                'table_info': self._get_tables_info(config.get('tables', [])),
-                'join_analysis': self._analyze_joins(config),
-                'output_analysis': self._analyze_output_structure(preview_data, config),
-                'data_quality': self._assess_data_quality(preview_data),
-                'preview_insights': self._generate_preview_insights(preview_data, config),
-                'export_recommendations': self._generate_export_recommendations(preview_data, config)
-            }
+            # Materialize the preview once; object dtype keeps the row values untouched
+            if preview_df is None:
+                preview_df = pd.DataFrame(preview_data, dtype=object)
+            
+            # The analyzers that query the database run in worker threads so
+            # their round-trips overlap with the in-memory analysis below
+            app = current_app._get_current_object()
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                statistics = executor.submit(self._run_in_app_context, app,
+                                             self._get_enhanced_preview_statistics, config, preview_df)
+                table_info = executor.submit(self._run_in_app_context, app,
+                                             self._get_tables_info, config.get('tables', []))
+                join_analysis = executor.submit(self._run_in_app_context, app, self._analyze_joins, config)
+                
+                analysis = {
+                    'output_analysis': self._analyze_output_structure(preview_df, config),
+                    'data_quality': self._assess_data_quality(preview_df, config),
+                    'preview_insights': self._generate_preview_insights(preview_df, config),
+                    'export_recommendations': self._generate_export_recommendations(preview_df, config)
+                }
+                analysis['statistics'] = statistics.result()
+                analysis['table_info'] = table_info.result()
+                analysis['join_analysis'] = join_analysis.result()
             
             return analysis
             
@@ -329,40 +589,54 @@ class RelationshipService:
                 'export_recommendations': []
             }
     
-    def _get_enhanced_preview_statistics(self, config: Dict[str, Any], preview_data: List[Dict]) -> Dict[str, Any]:
+    def _run_in_app_context(self, app, func, *args):
+        """Call ``func`` inside its own app context, and so its own db.session."""
+        with app.app_context():
+            return func(*args)
+    
+    def _get_enhanced_preview_statistics(self, config: Dict[str, Any], preview_df: pd.DataFrame) -> Dict[str, Any]:
         """Get enhanced statistics about the preview data."""
         try:
-            if not preview_data:
+            if preview_df.empty:
                 return {'preview_row_count': 0, 'columns': 0}
             
             stats = {
-                'preview_row_count': len(preview_data),
-                'total_columns': len(preview_data[0].keys()) if preview_data else 0,
+                'preview_row_count': len(preview_df),
+                'total_columns': len(preview_df.columns),
                 'column_analysis': {},
                 'data_distribution': {},
                 'memory_estimation': {},
                 'performance_metrics': {}
             }
             
-            # Enhanced column analysis
-            for column in preview_data[0].keys():
-                values = [row.get(column) for row in preview_data]
-                non_null_values = [v for v in values if v is not None and v != '']
+            # Enhanced column analysis; null and empty-string counts for every
+            # column come from one mask over the whole preview
+            total_values = len(preview_df)
+            empty_mask = self._empty_value_mask(preview_df)
+            null_counts = empty_mask.sum()
+            
+            for column in preview_df.columns:
+                non_null_values = preview_df[column][~empty_mask[column]]
+                non_null_count = len(non_null_values)
+                null_count = int(null_counts[column])
+                # Distinct values are hashed as they are; only the handful
+                # shown as samples are converted to strings
+                distinct_values = pd.unique(non_null_values)
                 
                 # Basic statistics
                 column_stats = {
-                    'total_values': len(values),
-                    'non_null_count': len(non_null_values),
-                    'null_count': len(values) - len(non_null_values),
-                    'null_percentage': round((len(values) - len(non_null_values)) / len(values) * 100, 2) if values else 0,
-                    'unique_count': len(set(str(v) for v in non_null_values)) if non_null_values else 0
+                    'total_values': total_values,
+                    'non_null_count': non_null_count,
+                    'null_count': null_count,
+                    'null_percentage': round(null_count / total_values * 100, 2) if total_values else 0,
+                    'unique_count': len(distinct_values)
                 }
                 
                 # Data type inference and analysis
-                if non_null_values:
+                if non_null_count:
                     column_stats.update(self._analyze_column_data_type(non_null_values))
-                    column_stats['sample_values'] = list(set(str(v) for v in non_null_values))[:5]
-                    column_stats['uniqueness_ratio'] = round(column_stats['unique_count'] / len(non_null_values), 3) if non_null_values else 0
+                    column_stats['sample_values'] = [str(v) for v in distinct_values[:5]]
+                    column_stats['uniqueness_ratio'] = round(column_stats['unique_count'] / non_null_count, 3)
                 else:
                     column_stats.update({
                         'inferred_type': 'unknown',
@@ -373,17 +647,11 @@ class RelationshipService:
                 stats['column_analysis'][column] = column_stats
             
             # Get total row counts for each table
-            total_counts = {}
+            total_counts = self._count_table_rows(config.get('tables', []))
             estimated_full_result_size = 0
             
-            for table in config.get('tables', []):
-                try:
-                    count_result = db.session.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                    total_counts[table] = count_result.scalar()
-                    if len(config.get('tables', [])) == 1:
-                        estimated_full_result_size = total_counts[table]
-                except Exception as e:
-                    total_counts[table] = 0
+            if len(config.get('tables', [])) == 1:
+                estimated_full_result_size = total_counts[config['tables'][0]]
             
             # Estimate full result size for joins
             if len(config.get('tables', [])) > 1:
@@ -393,89 +661,100 @@ class RelationshipService:
             stats['estimated_full_result_size'] = estimated_full_result_size
             
             # Memory estimation
-            stats['memory_estimation'] = self._estimate_memory_usage(preview_data, estimated_full_result_size)
+            stats['memory_estimation'] = self._estimate_memory_usage(preview_df, estimated_full_result_size)
             
             return stats
             
         except Exception as e:
             return {'error': str(e), 'preview_row_count': 0}
     
+    def _count_table_rows(self, tables: List[str]) -> Dict[str, int]:
+        """Count the rows of several tables in a single UNION ALL round-trip."""
+        counts = {table: 0 for table in tables}
+        
+        # Only existing tables are counted, so the names are safe to quote and
+        # one missing table cannot fail the whole statement
+        existing_tables = self._existing_tables()
+        countable = [table for table in counts if table in existing_tables]
+        if not countable:
+            return counts
+        
+        quote = db.engine.dialect.identifier_preparer.quote
+        query = " UNION ALL ".join(
+            f"SELECT :table_{i} AS table_name, COUNT(*) AS row_count FROM {quote(table)}"
+            for i, table in enumerate(countable)
+        )
+        params = {f'table_{i}': table for i, table in enumerate(countable)}
+        
+        try:
+            for table_name, row_count in db.session.execute(text(query), params):
+                counts[table_name] = row_count
+        except Exception as e:
+            print(f"Error counting rows for {', '.join(countable)}: {e}")
+        
+        return counts
+    
     def _analyze_column_data_type(self, values: List) -> Dict[str, Any]:
         """Analyze column values to infer data type and characteristics."""
-        if not values:
+        if len(values) == 0:
             return {'inferred_type': 'unknown'}
         
-        # Convert to strings for analysis
-        str_values = [str(v).strip() for v in values if v is not None]
-        
-        # Check for numeric types
-        numeric_count = 0
-        date_count = 0
-        boolean_count = 0
-        
-        for val in str_values[:min(100, len(str_values))]:  # Sample for performance
-            # Check if numeric
-            try:
-                float(val)
-                numeric_count += 1
-                continue
-            except:
-                pass
-            
-            # Check if date
-            if self._is_date_like(val):
-                date_count += 1
-                continue
-            
-            # Check if boolean
-            if val.lower() in ['true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n']:
-                boolean_count += 1
-        
-        sample_size = min(100, len(str_values))
+        # Convert to strings for analysis, sampling the first 100 for performance
+        sample = pd.Series(list(islice((v for v in values if v is not None), 100)), dtype=object)
+        sample_size = len(sample)
+        if not sample_size:
+            return {'inferred_type': 'unknown'}
+        sample = sample.astype(str).str.strip()
         
-        # Determine primary type
+        # Classify the sample one type at a time, in the order the thresholds
+        # are checked; numeric wins over date, and date over boolean, so each
+        # later mask is only computed when the earlier types were ruled out
+        numeric_mask = pd.to_numeric(sample, errors='coerce').notna().to_numpy()
+        numeric_count = int(numeric_mask.sum())
         if numeric_count / sample_size > 0.8:
+            lengths = self._value_lengths(values)
             return {
                 'inferred_type': 'numeric',
                 'numeric_ratio': round(numeric_count / sample_size, 3),
-                'min_length': min(len(str(v)) for v in values),
-                'max_length': max(len(str(v)) for v in values),
-                'avg_length': round(sum(len(str(v)) for v in values) / len(values), 1)
+                'min_length': int(lengths.min()),
+                'max_length': int(lengths.max()),
+                'avg_length': round(float(lengths.mean()), 1)
             }
-        elif date_count / sample_size > 0.6:
+        
+        date_mask = sample.str.match(_DATE_RE).to_numpy(dtype=bool) & ~numeric_mask
+        date_count = int(date_mask.sum())
+        if date_count / sample_size > 0.6:
+            lengths = self._value_lengths(values)
             return {
                 'inferred_type': 'date',
                 'date_ratio': round(date_count / sample_size, 3),
-                'min_length': min(len(str(v)) for v in values),
-                'max_length': max(len(str(v)) for v in values)
-            }
-        elif boolean_count / sample_size > 0.7:
-            return {
-                'inferred_type': 'boolean',
-                'boolean_ratio': round(boolean_count / sample_size, 3)
-            }
-        else:
-            return {
-                'inferred_type': 'text',
-                'min_length': min(len(str(v)) for v in values),
-                'max_length': max(len(str(v)) for v in values),
-                'avg_length': round(sum(len(str(v)) for v in values) / len(values), 1)
+                'min_length': int(lengths.min()),
+                'max_length': int(lengths.max())
             }
+        
+        # Boolean needs more than 70% of the sample, so skip the scan when the
+        # values left after numbers and dates cannot reach that
+        remaining = sample_size - numeric_count - date_count
+        if remaining / sample_size > 0.7:
+            boolean_mask = sample.str.lower().isin(['true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n']).to_numpy()
+            boolean_count = int((boolean_mask & ~(numeric_mask | date_mask)).sum())
+            if boolean_count / sample_size > 0.7:
+                return {
+                    'inferred_type': 'boolean',
+                    'boolean_ratio': round(boolean_count / sample_size, 3)
+                }
+        
+        lengths = self._value_lengths(values)
+        return {
+            'inferred_type': 'text',
+            'min_length': int(lengths.min()),
+            'max_length': int(lengths.max()),
+            'avg_length': round(float(lengths.mean()), 1)
+        }
     
-    def _is_date_like(self, value: str) -> bool:
-        """Check if a string value looks like a date."""
-        date_patterns = [
-            r'\d{4}-\d{2}-\d{2}',  # YYYY-MM-DD
-            r'\d{2}/\d{2}/\d{4}',  # MM/DD/YYYY
-            r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
-            r'\d{4}/\d{2}/\d{2}',  # YYYY/MM/DD
-        ]
-        
-        import re
-        for pattern in date_patterns:
-            if re.match(pattern, value.strip()):
-                return True
-        return False
+    def _value_lengths(self, values: List) -> np.ndarray:
+        """Return the string length of every value as an array."""
+        return pd.Series(values, dtype=object).astype(str).str.len().to_numpy()
     
     def _estimate_join_result_size(self, config: Dict[str, Any], table_counts: Dict[str, int]) -> int:
         """Estimate the size of the full join result."""
@@ -503,20 +782,18 @@ class RelationshipService:
         
         return max(base_size, 0)
     
-    def _estimate_memory_usage(self, preview_data: List[Dict], estimated_full_size: int) -> Dict[str, Any]:
+    def _estimate_memory_usage(self, preview_df: pd.DataFrame, estimated_full_size: int) -> Dict[str, Any]:
         """Estimate memory usage for the full dataset."""
-        if not preview_data:
+        if preview_df.empty:
             return {'estimated_mb': 0, 'preview_kb': 0}
         
         # Calculate average row size in bytes
-        sample_row = preview_data[0] if preview_data else {}
         avg_row_size = 0
         
-        for value in sample_row.values():
-            if value is not None:
-                avg_row_size += len(str(value)) * 2  # Rough estimate including overhead
+        for value in preview_df.iloc[0].dropna():
+            avg_row_size += len(str(value)) * 2  # Rough estimate including overhead
         
-        preview_size_kb = (len(preview_data) * avg_row_size) / 1024
+        preview_size_kb = (len(preview_df) * avg_row_size) / 1024
         estimated_full_mb = (estimated_full_size * avg_row_size) / (1024 * 1024)
         
         return {
@@ -526,9 +803,9 @@ class RelationshipService:
             'performance_warning': estimated_full_mb > 100
         }
     
-    def _analyze_output_structure(self, preview_data: List[Dict], config: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_output_structure(self, preview_df: pd.DataFrame, config: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze the structure and characteristics of the output data."""
-        if not preview_data:
+        if preview_df.empty:
             return {'empty_result': True}
         
         analysis = {
@@ -540,9 +817,10 @@ class RelationshipService:
         }
         
         # Group columns by source table
+        columns = list(preview_df.columns)
         tables = config.get('tables', [])
         for table in tables:
-            table_columns = [col for col in preview_data[0].keys() if col.startswith(f'{table}_') or len(tables) == 1]
+            table_columns = [col for col in columns if col.startswith(f'{table}_') or len(tables) == 1]
             if table_columns:
                 analysis['column_groups'][table] = {
                     'columns': table_columns,
@@ -550,14 +828,13 @@ class RelationshipService:
                 }
         
         # Analyze data normalization level
-        total_columns = len(preview_data[0].keys())
+        total_columns = len(columns)
         unique_ratios = []
         
-        for column, values in [(k, [row[k] for row in preview_data]) for k in preview_data[0].keys()]:
-            non_null = [v for v in values if v is not None]
-            if non_null:
-                unique_ratio = len(set(str(v) for v in non_null)) / len(non_null)
-                unique_ratios.append(unique_ratio)
+        for column in columns:
+            non_null = preview_df[column].dropna()
+            if len(non_null):
+                unique_ratios.append(non_null.nunique() / len(non_null))
         
         avg_uniqueness = sum(unique_ratios) / len(unique_ratios) if unique_ratios else 0
         
@@ -570,48 +847,54 @@ class RelationshipService:
         # Output characteristics
         analysis['output_characteristics'] = {
             'total_columns': total_columns,
-            'data_density': self._calculate_data_density(preview_data),
-            'column_correlation': self._analyze_column_correlations(preview_data),
-            'export_suitability': self._assess_export_suitability(preview_data)
+            'data_density': self._calculate_data_density(preview_df),
+            'column_correlation': self._analyze_column_correlations(preview_df),
+            'export_suitability': self._assess_export_suitability(preview_df)
         }
         
         return analysis
     
-    def _calculate_data_density(self, preview_data: List[Dict]) -> float:
+    def _empty_value_mask(self, preview_df: pd.DataFrame) -> pd.DataFrame:
+        """Flag cells that are null or empty strings."""
+        return preview_df.isna() | preview_df.eq('')
+    
+    def _calculate_data_density(self, preview_df: pd.DataFrame) -> float:
         """Calculate the density of non-null data."""
-        if not preview_data:
+        total_cells = preview_df.size
+        if not total_cells:
             return 0.0
         
-        total_cells = len(preview_data) * len(preview_data[0])
-        filled_cells = 0
-        
-        for row in preview_data:
-            for value in row.values():
-                if value is not None and value != '':
-                    filled_cells += 1
-        
-        return round(filled_cells / total_cells, 3) if total_cells > 0 else 0.0
+        filled_cells = total_cells - int(self._empty_value_mask(preview_df).to_numpy().sum())
+        return round(filled_cells / total_cells, 3)
     
-    def _analyze_column_correlations(self, preview_data: List[Dict]) -> Dict[str, Any]:
+    def _analyze_column_correlations(self, preview_df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze potential correlations between columns."""
-        if not preview_data or len(preview_data[0]) < 2:
+        if preview_df.empty or len(preview_df.columns) < 2:
             return {'correlation_count': 0, 'correlations': []}
         
-        columns = list(preview_data[0].keys())
+        columns = list(preview_df.columns)
         correlations = []
         
+        # Build each column's distinct value set once instead of per pair
+        col_sets = {
+            column: frozenset(preview_df[column].dropna().astype(str))
+            for column in columns
+        }
+        
         # Look for potential ID relationships
         for i, col1 in enumerate(columns):
+            values1 = col_sets[col1]
+            if not values1:
+                continue
             for col2 in columns[i+1:]:
                 # Check if columns might be related (simple heuristic)
-                values1 = [str(row[col1]) for row in preview_data if row[col1] is not None]
-                values2 = [str(row[col2]) for row in preview_data if row[col2] is not None]
+                values2 = col_sets[col2]
                 
-                if values1 and values2:
+                if values2:
                     # Check for potential relationships
-                    overlap = len(set(values1) & set(values2))
+                    overlap = len(values1 & values2)
                     if overlap > 0:
-                        correlation_strength = overlap / min(len(set(values1)), len(set(values2)))
+                        correlation_strength = overlap / min(len(values1), len(values2))
                         if correlation_strength > 0.1:  # Threshold for meaningful correlation
                             correlations.append({
                                 'column1': col1,
@@ -625,9 +908,9 @@ class RelationshipService:
             'correlations': correlations[:5]  # Limit to top 5
         }
     
-    def _assess_export_suitability(self, preview_data: List[Dict]) -> Dict[str, Any]:
+    def _assess_export_suitability(self, preview_df: pd.DataFrame) -> Dict[str, Any]:
         """Assess how suitable the data is for different export formats."""
-        if not preview_data:
+        if preview_df.empty:
             return {'formats': {}}
         
         suitability = {
@@ -637,18 +920,13 @@ class RelationshipService:
             'pdf': {'score': 5, 'notes': []}
         }
         
-        # Analyze characteristics that affect export suitability
-        total_columns = len(preview_data[0])
-        max_text_length = 0
-        has_special_chars = False
-        
-        for row in preview_data:
-            for value in row.values():
-                if value is not None:
-                    str_val = str(value)
-                    max_text_length = max(max_text_length, len(str_val))
-                    if any(char in str_val for char in ['\n', '\r', '\t', '"', "'"]):
-                        has_special_chars = True
+        # Analyze characteristics that affect export suitability over a flat
+        # array of the non-null cells' string forms
+        total_columns = len(preview_df.columns)
+        str_cells = preview_df.astype(str).to_numpy()[preview_df.notna().to_numpy()].astype(str)
+        max_text_length = int(np.char.str_len(str_cells).max()) if str_cells.size else 0
+        # One regex scan over the joined cells instead of a check per cell
+        has_special_chars = _EXPORT_SPECIAL_CHARS_RE.search('\x00'.join(str_cells)) is not None
         
         # Adjust scores based on characteristics
         if total_columns > 20:
@@ -669,11 +947,14 @@ class RelationshipService:
         
         return {'formats': suitability}
     
-    def _assess_data_quality(self, preview_data: List[Dict]) -> Dict[str, Any]:
+    def _assess_data_quality(self, preview_df: pd.DataFrame, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Assess the quality of the preview data."""
-        if not preview_data:
+        if preview_df.empty:
             return {'overall_score': 0, 'issues': [], 'recommendations': []}
         
+        columns = list(preview_df.columns)
+        column_count = len(columns)
+        
         quality_assessment = {
             'overall_score': 10,
             'issues': [],
@@ -683,19 +964,29 @@ class RelationshipService:
             'accuracy_indicators': {}
         }
         
-        # Assess completeness
-        total_cells = len(preview_data) * len(preview_data[0])
-        null_cells = 0
+        # Assess completeness over the full join result when it can be
+        # counted in SQL, otherwise over the preview rows
+        result_counts = None
+        if config is not None:
+            try:
+                result_counts = self._count_result_nulls(config, columns)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error counting nulls for the join result: {e}")
         
-        for row in preview_data:
-            for value in row.values():
-                if value is None or value == '':
-                    null_cells += 1
+        if result_counts and result_counts[0]:
+            rows_assessed, null_cells = result_counts
+            total_cells = rows_assessed * column_count
+        else:
+            rows_assessed = len(preview_df)
+            total_cells = preview_df.size
+            null_cells = int(self._empty_value_mask(preview_df).to_numpy().sum())
         
         completeness_score = (total_cells - null_cells) / total_cells if total_cells > 0 else 0
         quality_assessment['completeness'] = {
             'score': round(completeness_score, 3),
-            'null_percentage': round(null_cells / total_cells * 100, 2) if total_cells > 0 else 0
+            'null_percentage': round(null_cells / total_cells * 100, 2) if total_cells > 0 else 0,
+            'rows_assessed': rows_assessed
         }
         
         if completeness_score < 0.8:
@@ -705,14 +996,15 @@ class RelationshipService:
         
         # Assess consistency
         inconsistencies = 0
-        for column in preview_data[0].keys():
-            values = [str(row[column]).strip() for row in preview_data if row[column] is not None]
+        for column in columns:
+            # The formatting check only samples the first 20 values
+            values = preview_df[column].dropna().iloc[:20].astype(str).str.strip().tolist()
             if values:
                 # Check for inconsistent formatting
                 if self._has_inconsistent_formatting(values):
                     inconsistencies += 1
         
-        consistency_score = 1 - (inconsistencies / len(preview_data[0])) if preview_data[0] else 1
+        consistency_score = 1 - (inconsistencies / column_count) if column_count else 1
         quality_assessment['consistency'] = {
             'score': round(consistency_score, 3),
             'inconsistent_columns': inconsistencies
@@ -724,7 +1016,7 @@ class RelationshipService:
             quality_assessment['recommendations'].append('Standardize data formats before export')
         
         # Look for potential accuracy issues
-        accuracy_issues = self._detect_accuracy_issues(preview_data)
+        accuracy_issues = self._detect_accuracy_issues(preview_df, columns)
         quality_assessment['accuracy_indicators'] = accuracy_issues
         
         if accuracy_issues['suspicious_patterns'] > 0:
@@ -735,24 +1027,75 @@ class RelationshipService:
         
         return quality_assessment
     
+    def _known_result_rows(self, config: Dict[str, Any], default: int) -> int:
+        """Return the full join result's row count if it was already counted, else ``default``."""
+        try:
+            query, params = self._build_join_query(config)
+        except Exception:
+            return default
+        
+        counts = self._cached_result(self._completeness_cache, (query, tuple(sorted(params.items()))))
+        if counts is not None:
+            return max(counts[0], default)
+        return default
+    
+    def _count_result_nulls(self, config: Dict[str, Any], columns: List[str]) -> Tuple[int, int]:
+        """Count the full join result's rows and null or empty cells in one aggregate query."""
+        query, params = self._build_join_query(config)
+        cache_key = (query, tuple(sorted(params.items())))
+        
+        cached = self._cached_result(self._completeness_cache, cache_key)
+        if cached is not None:
+            return cached
+        
+        # Empty strings count as missing, as in the preview; the cast keeps
+        # the comparison valid for non-text columns
+        quote = db.engine.dialect.identifier_preparer.quote
+        null_sums = ', '.join(
+            f"SUM(CASE WHEN COALESCE(CAST({quote(column)} AS VARCHAR), '') = '' THEN 1 ELSE 0 END)"
+            for column in columns
+        )
+        row = db.session.execute(text(f"SELECT COUNT(*), {null_sums} FROM ({query}) AS joined_result"),
+                                 params).fetchone()
+        
+        counts = (row[0], sum(value or 0 for value in row[1:]))
+        self._store_result(self._completeness_cache, cache_key, counts, _COMPLETENESS_CACHE_SIZE)
+        return counts
+    
+    def _cached_result(self, cache: OrderedDict, key: Any) -> Any:
+        """Return a value from a bounded (timestamp, value) cache, or None once it has expired."""
+        with self._result_cache_lock:
+            cached = cache.get(key)
+            if cached and time.time() - cached[0] < self._cache_timeout:
+                cache.move_to_end(key)
+                return cached[1]
+        return None
+    
+    def _store_result(self, cache: OrderedDict, key: Any, value: Any, max_entries: int) -> None:
+        """Store a value in a bounded cache, evicting expired and least recently used entries."""
+        now = time.time()
+        with self._result_cache_lock:
+            cache[key] = (now, value)
+            cache.move_to_end(key)
+            expired = [cache_key for cache_key, (stored_at, _) in cache.items()
+                       if now - stored_at >= self._cache_timeout]
+            for cache_key in expired:
+                del cache[cache_key]
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+    
     def _has_inconsistent_formatting(self, values: List[str]) -> bool:
         """Check if values have inconsistent formatting."""
         if len(values) < 2:
             return False
         
-        # Check date formatting inconsistencies
+        # Classify date separators and text case in a single pass and stop
+        # as soon as either inconsistency is established
         date_formats = set()
-        for value in values[:20]:  # Sample for performance
-            if self._is_date_like(value):
-                if '-' in value:
-                    date_formats.add('dash')
-                elif '/' in value:
-                    date_formats.add('slash')
-        
-        # Check case inconsistencies in text
         case_patterns = set()
-        for value in values[:20]:
+        for value in values[:20]:  # Sample for performance
             if value.isalpha():
+                # Purely alphabetic values can never match the date patterns
                 if value.isupper():
                     case_patterns.add('upper')
                 elif value.islower():
@@ -761,11 +1104,24 @@ class RelationshipService:
                     case_patterns.add('title')
                 else:
                     case_patterns.add('mixed')
+                if len(case_patterns) > 2:
+                    return True
+            else:
+                # One match both detects a date and captures its separator
+                date_match = _DATE_RE.match(value.strip())
+                if date_match:
+                    separator = date_match.group(1) or date_match.group(2)
+                    date_formats.add('dash' if separator == '-' else 'slash')
+                    if len(date_formats) > 1:
+                        return True
         
-        return len(date_formats) > 1 or len(case_patterns) > 2
+        return False
     
-    def _detect_accuracy_issues(self, preview_data: List[Dict]) -> Dict[str, Any]:
+    def _detect_accuracy_issues(self, preview_df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
         """Detect potential accuracy issues in the data."""
+        if columns is None:
+            columns = list(preview_df.columns)
+        
         issues = {
             'suspicious_patterns': 0,
             'potential_duplicates': 0,
@@ -774,39 +1130,56 @@ class RelationshipService:
         }
         
         # Check for exact duplicate rows
-        row_hashes = set()
-        for row in preview_data:
-            row_str = str(sorted(row.items()))
-            if row_str in row_hashes:
-                issues['potential_duplicates'] += 1
-            else:
-                row_hashes.add(row_str)
+        issues['potential_duplicates'] = self._count_duplicate_rows(preview_df)
         
         # Check for suspicious patterns (all same values, sequential IDs, etc.)
-        for column in preview_data[0].keys():
-            values = [row[column] for row in preview_data if row[column] is not None]
-            if values:
-                unique_values = set(str(v) for v in values)
-                
+        value_counts = preview_df.count()
+        distinct_counts = preview_df.nunique(dropna=True)
+        for column in columns:
+            if value_counts[column]:
                 # All same values
-                if len(unique_values) == 1 and len(values) > 10:
+                if distinct_counts[column] == 1 and value_counts[column] > 10:
                     issues['suspicious_patterns'] += 1
                     issues['details'].append(f'Column {column}: All values are identical')
                 
                 # Sequential numbers that might indicate test data
-                if all(isinstance(v, (int, float)) for v in values[:10]):
-                    numeric_values = [float(v) for v in values[:10]]
-                    if all(numeric_values[i] + 1 == numeric_values[i+1] for i in range(len(numeric_values)-1)):
+                first_values = preview_df[column].dropna().iloc[:10].tolist()
+                if all(isinstance(v, (int, float)) for v in first_values):
+                    numeric_values = np.asarray(first_values, dtype=np.float64)
+                    if numeric_values.size >= 2 and np.all(np.diff(numeric_values) == 1):
                         issues['suspicious_patterns'] += 1
                         issues['details'].append(f'Column {column}: Sequential numeric pattern detected')
         
         return issues
     
-    def _generate_preview_insights(self, preview_data: List[Dict], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _count_duplicate_rows(self, preview_df: pd.DataFrame) -> int:
+        """Count rows that repeat an earlier row exactly."""
+        if len(preview_df) <= _TUPLE_DUPLICATE_MAX_ROWS:
+            # Column order is fixed by the query, so plain row tuples can be
+            # hashed directly by the set
+            seen = set()
+            duplicates = 0
+            try:
+                for key in preview_df.itertuples(index=False, name=None):
+                    if key in seen:
+                        duplicates += 1
+                    else:
+                        seen.add(key)
+                return duplicates
+            except TypeError:
+                # Unhashable cell values; use the pandas hashing below
+                pass
+        
+        # Each row is reduced to one uint64 hash in a vectorized pass and
+        # only the hashes are compared
+        row_hashes = pd.util.hash_pandas_object(preview_df, index=False)
+        return int(row_hashes.duplicated().sum())
+    
+    def _generate_preview_insights(self, preview_df: pd.DataFrame, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate insights about the preview data for users."""
         insights = []
         
-        if not preview_data:
+        if preview_df.empty:
             insights.append({
                 'type': 'warning',
                 'title': 'No Data Found',
@@ -816,7 +1189,7 @@ class RelationshipService:
             return insights
         
         # Data volume insights
-        row_count = len(preview_data)
+        row_count = len(preview_df)
         if row_count == 100:  # Likely hit the limit
             insights.append({
                 'type': 'info',
@@ -826,7 +1199,7 @@ class RelationshipService:
             })
         
         # Column insights
-        columns = list(preview_data[0].keys())
+        columns = list(preview_df.columns)
         if len(columns) > 15:
             insights.append({
                 'type': 'warning',
@@ -836,7 +1209,7 @@ class RelationshipService:
             })
         
         # Data quality insights
-        null_percentage = sum(1 for row in preview_data for value in row.values() if value is None) / (len(preview_data) * len(columns)) * 100
+        null_percentage = float(preview_df.isna().to_numpy().mean()) * 100 if preview_df.size else 0
         if null_percentage > 30:
             insights.append({
                 'type': 'warning',
@@ -883,16 +1256,19 @@ class RelationshipService:
         
         return min(reduction_factor, 0.9)
     
-    def _generate_export_recommendations(self, preview_data: List[Dict], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_export_recommendations(self, preview_df: pd.DataFrame, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate recommendations for exporting the data."""
         recommendations = []
         
-        if not preview_data:
+        if preview_df.empty:
             return recommendations
         
-        # Size recommendations
-        estimated_size = len(preview_data) * 10  # Rough estimate
-        if estimated_size > 1000:
+        # Size recommendations: the in-memory size of a few sampled rows,
+        # extrapolated to the full result when its row count is known
+        sample = preview_df.iloc[:5].to_numpy()
+        avg_row_bytes = sum(sys.getsizeof(value) for value in sample.ravel()) / len(sample)
+        estimated_bytes = int(avg_row_bytes * self._known_result_rows(config, len(preview_df)))
+        if estimated_bytes > 10 * 1024 * 1024:
             recommendations.append({
                 'type': 'performance',
                 'title': 'Large Dataset',
@@ -902,13 +1278,13 @@ class RelationshipService:
             })
         
         # Format recommendations based on data characteristics
-        columns = list(preview_data[0].keys())
-        has_long_text = any(
-            len(str(value)) > 100 
-            for row in preview_data[:10] 
-            for value in row.values() 
-            if value is not None
-        )
+        columns = list(preview_df.columns)
+        
+        # Text checks look at the non-null cells of the first 10 rows; with
+        # so few cells, short-circuiting scans beat building string arrays
+        head = preview_df.iloc[:10]
+        head_cells = [str(value) for value in head.to_numpy()[head.notna().to_numpy()]]
+        has_long_text = any(len(cell) > 100 for cell in head_cells)
         
         if has_long_text:
             recommendations.append({
@@ -919,7 +1295,7 @@ class RelationshipService:
                 'priority': 'medium'
             })
         
-        if len(columns) <= 5 and len(preview_data) <= 100:
+        if len(columns) <= 5 and len(preview_df) <= 100:
             recommendations.append({
                 'type': 'format',
                 'title': 'Small Clean Dataset',
@@ -929,12 +1305,7 @@ class RelationshipService:
             })
         
         # Special character recommendations
-        has_special_chars = any(
-            any(char in str(value) for char in ['\n', '\r', '\t', ',', '"']) 
-            for row in preview_data[:10] 
-            for value in row.values() 
-            if value is not None
-        )
+        has_special_chars = any(not _CSV_SPECIAL_CHARS.isdisjoint(cell) for cell in head_cells)
         
         if has_special_chars:
             recommendations.append({
@@ -951,24 +1322,23 @@ class RelationshipService:
         """Get detailed information about the tables involved."""
         info = {}
         
+        # All row counts come back from one UNION ALL query; each table then
+        # needs only its sample round-trip
+        row_counts = self._count_table_rows(tables)
+        quote = db.engine.dialect.identifier_preparer.quote
+        
         for table in tables:
             try:
                 # Get column info
                 columns = self.get_table_columns(table)
                 
-                # Get row count
-                count_result = db.session.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                row_count = count_result.scalar()
-                
                 # Get sample data
-                sample_result = db.session.execute(text(f"SELECT * FROM {table} LIMIT 3"))
-                sample_data = []
-                for row in sample_result:
-                    sample_data.append({columns[i]['name']: value for i, value in enumerate(row)})
+                sample_result = db.session.execute(text(f"SELECT * FROM {quote(table)} LIMIT 3"))
+                sample_data = [dict(row) for row in sample_result.mappings()]
                 
                 info[table] = {
                     'columns': columns,
-                    'row_count': row_count,
+                    'row_count': row_counts[table],
                     'sample_data': sample_data
                 }
                 
@@ -986,6 +1356,26 @@ class RelationshipService:
             'recommendations': []
         }
         
+        # Count every table's rows and the distinct values of all of its
+        # join columns in one query per table rather than four per join
+        join_columns = defaultdict(set)
+        for join in config.get('joins', []):
+            if all(key in join for key in ('table1', 'table2', 'column1', 'column2')):
+                join_columns[join['table1']].add(join['column1'])
+                join_columns[join['table2']].add(join['column2'])
+        
+        table_stats = {}
+        table_errors = {}
+        for table, columns in join_columns.items():
+            try:
+                # Unknown columns are left out so they only fail their own join
+                known_columns = {col['name'] for col in self.get_table_columns(table)}
+                if not known_columns:
+                    raise ValueError(f"Table '{table}' not found")
+                table_stats[table] = self._get_join_column_stats(table, sorted(columns & known_columns))
+            except Exception as e:
+                table_errors[table] = e
+        
         for join in config.get('joins', []):
             try:
                 table1 = join['table1']
@@ -994,12 +1384,15 @@ class RelationshipService:
                 column2 = join['column2']
                 join_type = join.get('join_type', 'INNER')
                 
-                # Analyze join cardinality
-                count1_query = f"SELECT COUNT(DISTINCT {column1}) FROM {table1}"
-                count2_query = f"SELECT COUNT(DISTINCT {column2}) FROM {table2}"
+                for table, column in ((table1, column1), (table2, column2)):
+                    if table in table_errors:
+                        raise table_errors[table]
+                    if column not in table_stats[table]:
+                        raise ValueError(f"Column '{column}' not found in table '{table}'")
                 
-                distinct1 = db.session.execute(text(count1_query)).scalar()
-                distinct2 = db.session.execute(text(count2_query)).scalar()
+                # Analyze join cardinality
+                total1, distinct1 = table_stats[table1]['total'], table_stats[table1][column1]
+                total2, distinct2 = table_stats[table2]['total'], table_stats[table2][column2]
                 
                 # Check for potential many-to-many relationships
                 join_analysis = {
@@ -1010,7 +1403,7 @@ class RelationshipService:
                     'join_type': join_type,
                     'distinct_values_1': distinct1,
                     'distinct_values_2': distinct2,
-                    'estimated_cardinality': self._estimate_join_cardinality(table1, column1, table2, column2)
+                    'estimated_cardinality': self._estimate_join_cardinality(total1, distinct1, total2, distinct2)
                 }
                 
                 analysis['join_details'].append(join_analysis)
@@ -1026,34 +1419,40 @@ class RelationshipService:
         
         return analysis
     
-    def _estimate_join_cardinality(self, table1: str, column1: str, table2: str, column2: str) -> str:
-        """Estimate the cardinality of a join relationship."""
-        try:
-            # Check if it's one-to-one, one-to-many, or many-to-many
-            query1 = f"SELECT COUNT(*) as total, COUNT(DISTINCT {column1}) as distinct_vals FROM {table1}"
-            query2 = f"SELECT COUNT(*) as total, COUNT(DISTINCT {column2}) as distinct_vals FROM {table2}"
-            
-            result1 = db.session.execute(text(query1)).fetchone()
-            result2 = db.session.execute(text(query2)).fetchone()
-            
-            total1, distinct1 = result1[0], result1[1]
-            total2, distinct2 = result2[0], result2[1]
-            
-            # Simple heuristic for cardinality estimation
-            if distinct1 == total1 and distinct2 == total2:
-                return "one-to-one"
-            elif distinct1 == total1:
-                return "one-to-many"
-            elif distinct2 == total2:
-                return "many-to-one"
-            else:
-                return "many-to-many"
-                
-        except Exception:
-            return "unknown"
+    def _get_join_column_stats(self, table: str, columns: List[str]) -> Dict[str, int]:
+        """Count a table's rows and each column's distinct values in a single query."""
+        cache_key = (table, tuple(columns))
+        cached = self._cached_result(self._table_stats_cache, cache_key)
+        if cached is not None:
+            return cached
+        
+        quote = db.engine.dialect.identifier_preparer.quote
+        distinct_counts = ', '.join(f"COUNT(DISTINCT {quote(column)})" for column in columns)
+        row = db.session.execute(text(f"SELECT COUNT(*), {distinct_counts} FROM {quote(table)}")).fetchone()
+        
+        stats = {'total': row[0]}
+        stats.update(zip(columns, row[1:]))
+        self._store_result(self._table_stats_cache, cache_key, stats, _TABLE_STATS_CACHE_SIZE)
+        return stats
     
-    def _build_join_query(self, config: Dict[str, Any], limit: Optional[int] = None) -> str:
-        """Build SQL query for joining tables based on configuration."""
+    def _estimate_join_cardinality(self, total1: int, distinct1: int, total2: int, distinct2: int) -> str:
+        """Estimate the cardinality of a join relationship from row and distinct counts."""
+        # Simple heuristic for cardinality estimation
+        if distinct1 == total1 and distinct2 == total2:
+            return "one-to-one"
+        elif distinct1 == total1:
+            return "one-to-many"
+        elif distinct2 == total2:
+            return "many-to-one"
+        else:
+            return "many-to-many"
+    
+    def _build_join_query(self, config: Dict[str, Any], limit: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+        """Build SQL query for joining tables based on configuration.
+        
+        Filter values and the limit are returned as bind parameters, so
+        previews of the same shape share one SQL text and prepared statement.
+        """
         tables = config.get('tables', [])
         joins = config.get('joins', [])
         filters = config.get('filters', [])
@@ -1062,6 +1461,58 @@ class RelationshipService:
         if not tables:
             raise ValueError("No tables specified")
         
+        query_parts = [self._build_join_template(tables, joins, selected_columns)]
+        params = {}
+        
+        # Build WHERE clause from filters and custom where
+        where_conditions = []
+        
+        # Add filter conditions
+        for filter_rule in filters:
+            condition, condition_params = self._build_filter_condition(filter_rule, len(params))
+            if condition:
+                where_conditions.append(condition)
+                params.update(condition_params)
+        
+        # Add custom WHERE clause if specified
+        custom_where = config.get('where_clause', '').strip()
+        if custom_where:
+            where_conditions.append(f"({custom_where})")
+        
+        # Add WHERE clause if we have conditions
+        if where_conditions:
+            query_parts.append(f"WHERE {' AND '.join(where_conditions)}")
+        
+        # Add ORDER BY if specified
+        order_by = config.get('order_by', '').strip()
+        if order_by:
+            query_parts.append(f"ORDER BY {order_by}")
+        
+        # Add LIMIT if specified
+        if limit:
+            query_parts.append("LIMIT :row_limit")
+            params['row_limit'] = int(limit)
+        
+        return ' '.join(query_parts), params
+    
+    def _build_join_template(self, tables: List[str], joins: List[Dict[str, Any]],
+                             selected_columns: Dict[str, List[str]]) -> str:
+        """Build the SELECT, FROM and JOIN clauses, memoized on the configuration's shape."""
+        shape_key = (
+            tuple(tables),
+            tuple((join['table1'], join['table2'], join['column1'], join['column2'],
+                   join.get('join_type', 'INNER'), join.get('condition_type', '='))
+                  for join in joins),
+            tuple((table, tuple(selected_columns.get(table, []))) for table in tables)
+        )
+        cached = self._join_template_cache.get(shape_key)
+        if cached is not None:
+            return cached
+        
+        # Identifiers go through the dialect's quoting, which leaves plain
+        # names untouched and quotes reserved words or unusual characters
+        quote = db.engine.dialect.identifier_preparer.quote
+        
         # Start with the first table
         main_table = tables[0]
         query_parts = []
@@ -1077,13 +1528,13 @@ class RelationshipService:
             for col in table_columns:
                 # For single table, don't prefix with table name to avoid redundancy
                 if len(tables) == 1:
-                    select_columns.append(f"{col}")
+                    select_columns.append(quote(col))
                 else:
                     # Avoid duplicate column names by prefixing with table name
-                    select_columns.append(f"{table}.{col} AS {table}_{col}")
+                    select_columns.append(f"{quote(table)}.{quote(col)} AS {quote(f'{table}_{col}')}")
         
         query_parts.append(f"SELECT {', '.join(select_columns)}")
-        query_parts.append(f"FROM {main_table}")
+        query_parts.append(f"FROM {quote(main_table)}")
         
         # Add joins
         for join in joins:
@@ -1091,43 +1542,27 @@ class RelationshipService:
             table2 = join['table2']
             column1 = join['column1']
             column2 = join['column2']
-            join_type = join.get('join_type', 'INNER')
+            join_type = join.get('join_type', 'INNER').upper()
             condition_type = join.get('condition_type', '=')
             
-            join_condition = f"{table1}.{column1} {condition_type} {table2}.{column2}"
-            query_parts.append(f"{join_type} JOIN {table2} ON {join_condition}")
-        
-        # Build WHERE clause from filters and custom where
-        where_conditions = []
-        
-        # Add filter conditions
-        for filter_rule in filters:
-            condition = self._build_filter_condition(filter_rule)
-            if condition:
-                where_conditions.append(condition)
-        
-        # Add custom WHERE clause if specified
-        custom_where = config.get('where_clause', '').strip()
-        if custom_where:
-            where_conditions.append(f"({custom_where})")
-        
-        # Add WHERE clause if we have conditions
-        if where_conditions:
-            query_parts.append(f"WHERE {' AND '.join(where_conditions)}")
-        
-        # Add ORDER BY if specified
-        order_by = config.get('order_by', '').strip()
-        if order_by:
-            query_parts.append(f"ORDER BY {order_by}")
-        
-        # Add LIMIT if specified
-        if limit:
-            query_parts.append(f"LIMIT {limit}")
+            if join_type not in _JOIN_TYPES:
+                raise ValueError(f"Unsupported join type: {join_type}")
+            if condition_type not in _COMPARISON_OPERATORS:
+                raise ValueError(f"Unsupported join condition: {condition_type}")
+            
+            join_condition = f"{quote(table1)}.{quote(column1)} {condition_type} {quote(table2)}.{quote(column2)}"
+            query_parts.append(f"{join_type} JOIN {quote(table2)} ON {join_condition}")
         
-        return ' '.join(query_parts)
+        template = ' '.join(query_parts)
+        self._join_template_cache[shape_key] = template
+        return template
     
-    def _build_filter_condition(self, filter_rule: Dict[str, Any]) -> str:
-        """Build a SQL condition from a filter rule."""
+    def _build_filter_condition(self, filter_rule: Dict[str, Any], param_index: int = 0) -> Tuple[str, Dict[str, Any]]:
+        """Build a SQL condition and its bind parameters from a filter rule.
+        
+        Placeholders are numbered from ``param_index`` so conditions can be
+        combined into one query without clashing.
+        """
         table = filter_rule.get('table')
         column = filter_rule.get('column')
         operator = filter_rule.get('operator')
@@ -1136,32 +1571,38 @@ class RelationshipService:
         data_type = filter_rule.get('data_type', 'text')
         
         if not table or not column or not operator:
-            return ''
+            return '', {}
+        
+        if operator not in _FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
         
-        column_ref = f"{table}.{column}"
+        quote = db.engine.dialect.identifier_preparer.quote
+        column_ref = f"{quote(table)}.{quote(column)}"
         
         # Handle NULL checks
         if operator == 'IS NULL':
-            return f"{column_ref} IS NULL"
+            return f"{column_ref} IS NULL", {}
         elif operator == 'IS NOT NULL':
-            return f"{column_ref} IS NOT NULL"
+            return f"{column_ref} IS NOT NULL", {}
         
         if not value:
-            return ''
+            return '', {}
+        
+        param = f"p{param_index}"
+        param2 = f"p{param_index + 1}"
         
-        # Format value based on data type
+        # Bind the value based on data type
         if data_type == 'text':
-            escaped_value = value.replace("'", "''")  # Escape single quotes
             if operator == 'LIKE':
-                return f"{column_ref} LIKE '%{escaped_value}%'"
+                return f"{column_ref} LIKE :{param}", {param: f"%{value}%"}
             elif operator == 'NOT LIKE':
-                return f"{column_ref} NOT LIKE '%{escaped_value}%'"
+                return f"{column_ref} NOT LIKE :{param}", {param: f"%{value}%"}
             elif operator == 'STARTS_WITH':
-                return f"{column_ref} LIKE '{escaped_value}%'"
+                return f"{column_ref} LIKE :{param}", {param: f"{value}%"}
             elif operator == 'ENDS_WITH':
-                return f"{column_ref} LIKE '%{escaped_value}'"
+                return f"{column_ref} LIKE :{param}", {param: f"%{value}"}
             else:
-                return f"{column_ref} {operator} '{escaped_value}'"
+                return f"{column_ref} {operator} :{param}", {param: value}
         
         elif data_type == 'number':
             try:
@@ -1169,48 +1610,38 @@ class RelationshipService:
                 if operator == 'BETWEEN':
                     if value2:
                         num_value2 = float(value2)
-                        return f"{column_ref} BETWEEN {num_value} AND {num_value2}"
+                        return f"{column_ref} BETWEEN :{param} AND :{param2}", {param: num_value, param2: num_value2}
                 elif operator == 'NOT BETWEEN':
                     if value2:
                         num_value2 = float(value2)
-                        return f"{column_ref} NOT BETWEEN {num_value} AND {num_value2}"
+                        return f"{column_ref} NOT BETWEEN :{param} AND :{param2}", {param: num_value, param2: num_value2}
                 else:
-                    return f"{column_ref} {operator} {num_value}"
+                    return f"{column_ref} {operator} :{param}", {param: num_value}
             except ValueError:
-                return ''
+                return '', {}
         
         elif data_type == 'date':
             # Validate date format (basic validation)
             if len(value) == 10 and value.count('-') == 2:
                 if operator == 'BETWEEN':
                     if value2 and len(value2) == 10 and value2.count('-') == 2:
-                        return f"{column_ref} BETWEEN '{value}' AND '{value2}'"
+                        return f"{column_ref} BETWEEN :{param} AND :{param2}", {param: value, param2: value2}
                 elif operator == 'NOT BETWEEN':
                     if value2 and len(value2) == 10 and value2.count('-') == 2:
-                        return f"{column_ref} NOT BETWEEN '{value}' AND '{value2}'"
+                        return f"{column_ref} NOT BETWEEN :{param} AND :{param2}", {param: value, param2: value2}
                 else:
-                    return f"{column_ref} {operator} '{value}'"
+                    return f"{column_ref} {operator} :{param}", {param: value}
         
-        return ''
+        return '', {}
     
     def export_joined_data_to_excel(self, config: Dict[str, Any], filename: Optional[str] = None) -> Dict[str, Any]:
         """Export joined data to Excel file."""
         try:
-            # Get the full dataset (no limit)
-            query = self._build_join_query(config)
-            result = db.session.execute(text(query))
+            # Get the full dataset (no limit), streamed from the cursor in batches
+            query, params = self._build_join_query(config)
+            result = db.session.execute(text(query), params,
+                                        execution_options={'stream_results': True, 'yield_per': 1000})
             columns = list(result.keys())
-            rows = result.fetchall()
-            
-            # Convert to pandas DataFrame
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    row_dict[columns[i]] = value
-                data.append(row_dict)
-            
-            df = pd.DataFrame(data)
             
             # Generate filename if not provided
             if not filename:
@@ -1223,39 +1654,45 @@ class RelationshipService:
             os.makedirs(uploads_dir, exist_ok=True)
             file_path = os.path.join(uploads_dir, filename)
             
-            # Create workbook with multiple sheets
-            wb = Workbook()
+            # Write-only workbook: rows are serialized as they are appended
+            # instead of being held as cell objects until save
+            wb = Workbook(write_only=True)
             
             # Main data sheet
-            ws_data = wb.active
-            ws_data.title = "Joined Data"
+            ws_data = wb.create_sheet("Joined Data")
+            
+            # A write-only sheet needs its column widths before the first row,
+            # so they are measured in one pass over the first streamed batch
+            first_batch = result.fetchmany(1000)
+            max_lengths = [len(str(header)) for header in columns]
+            for row in first_batch:
+                for col_index, value in enumerate(row):
+                    if value is not None:
+                        length = len(str(value))
+                        if length > max_lengths[col_index]:
+                            max_lengths[col_index] = length
+            
+            for col_num, max_length in enumerate(max_lengths, 1):
+                adjusted_width = min(max_length + 2, 50)
+                ws_data.column_dimensions[get_column_letter(col_num)].width = adjusted_width
             
             # Add headers with styling
             header_font = Font(bold=True, color="FFFFFF")
             header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
             
-            for col_num, header in enumerate(columns, 1):
-                cell = ws_data.cell(row=1, column=col_num, value=header)
+            header_cells = []
+            for header in columns:
+                cell = WriteOnlyCell(ws_data, value=header)
                 cell.font = header_font
                 cell.fill = header_fill
+                header_cells.append(cell)
+            ws_data.append(header_cells)
             
             # Add data
-            for row_num, row_data in enumerate(data, 2):
-                for col_num, header in enumerate(columns, 1):
-                    ws_data.cell(row=row_num, column=col_num, value=row_data.get(header))
-            
-            # Auto-adjust column widths
-            for column in ws_data.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws_data.column_dimensions[column_letter].width = adjusted_width
+            record_count = 0
+            for row in chain(first_batch, result):
+                ws_data.append(list(row))
+                record_count += 1
             
             # Add configuration sheet
             ws_config = wb.create_sheet("Configuration")
@@ -1265,7 +1702,7 @@ class RelationshipService:
                 ["Tables:", ", ".join(config.get('tables', []))],
                 ["Join Type:", config.get('joins', [{}])[0].get('join_type', 'N/A') if config.get('joins') else 'N/A'],
                 ["Generated:", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                ["Total Records:", len(data)],
+                ["Total Records:", record_count],
                 [""],
                 ["Joins:"]
             ]
@@ -1275,9 +1712,8 @@ class RelationshipService:
                     f"{join['table1']}.{join['column1']} = {join['table2']}.{join['column2']} ({join.get('join_type', 'INNER')})"
                 ])
             
-            for row_num, row_data in enumerate(config_data, 1):
-                for col_num, value in enumerate(row_data, 1):
-                    ws_config.cell(row=row_num, column=col_num, value=value)
+            for row_data in config_data:
+                ws_config.append(row_data)
             
             # Save the workbook
             wb.save(file_path)
@@ -1286,7 +1722,7 @@ class RelationshipService:
                 'success': True,
                 'filename': filename,
                 'file_path': file_path,
-                'record_count': len(data),
+                'record_count': record_count,
                 'column_count': len(columns)
             }
             
@@ -1299,21 +1735,15 @@ class RelationshipService:
     def get_table_sample_data(self, table_name: str, limit: int = 5) -> Dict[str, Any]:
         """Get sample data from a table for relationship analysis."""
         try:
-            inspector = inspect(db.engine)
-            if table_name not in inspector.get_table_names():
+            if table_name not in self._existing_tables():
                 return {'success': False, 'error': 'Table not found'}
             
             query = f"SELECT * FROM {table_name} LIMIT {limit}"
             result = db.session.execute(text(query))
             columns = list(result.keys())
-            rows = result.fetchall()
             
-            data = []
-            for row in rows:
-                row_dict = {}
-                for i, value in enumerate(row):
-                    row_dict[columns[i]] = value
-                data.append(row_dict)
+            # RowMapping rows are already keyed by column name
+            data = [dict(row) for row in result.mappings()]
             
             return {
                 'success': True,
@@ -1336,10 +1766,9 @@ class RelationshipService:
                 raise ValueError("Only SELECT queries are allowed")
             
             # Additional security checks
-            dangerous_keywords = ['DROP', 'DELETE', 'UPDATE', 'INSERT', 'ALTER', 'CREATE', 'EXEC', 'EXECUTE']
-            for keyword in dangerous_keywords:
-                if keyword in query_upper:
-                    raise ValueError(f"Query contains forbidden keyword: {keyword}")
+            banned = _BANNED_KEYWORDS_RE.search(query)
+            if banned:
+                raise ValueError(f"Query contains forbidden keyword: {banned.group(0).upper()}")
             
             # Get database path
             if database == 'stock':
@@ -1350,23 +1779,19 @@ class RelationshipService:
             if not os.path.exists(db_path):
                 raise Exception(f"Database {database} not found")
             
-            # Execute the query using direct SQLite connection
-            import sqlite3
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row  # This allows us to access columns by name
-            cursor = conn.cursor()
+            # Execute the query on this thread's cached SQLite connection
+            cursor = _get_sqlite_connection(db_path).cursor()
             
             # Execute the query
             cursor.execute(query)
-            rows = cursor.fetchall()
             
             # Get column names
             columns = [description[0] for description in cursor.description] if cursor.description else []
             
-            # Convert rows to list of dictionaries
-            data = [dict(row) for row in rows]
-            
-            conn.close()
+            # Build the row dictionaries straight from the cursor's plain
+            # tuples, without an intermediate sqlite3.Row per row
+            data = [dict(zip(columns, row)) for row in cursor]
+            cursor.close()
             
             return {
                 'data': data,
@@ -1389,47 +1814,35 @@ class RelationshipService:
             if not os.path.exists(db_path):
                 raise Exception(f"Database {database} not found")
             
-            import sqlite3
-            import json
-            
-            conn = sqlite3.connect(db_path)
+            conn = _get_sqlite_connection(db_path)
             cursor = conn.cursor()
             
-            # Create configurations table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS relationship_configurations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name VARCHAR(255) NOT NULL UNIQUE,
-                    configuration TEXT NOT NULL,
-                    created_date DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_date DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            config_json = json.dumps(config)
-            
-            # Check if configuration name already exists
-            cursor.execute("SELECT id FROM relationship_configurations WHERE name = ?", (name,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing configuration
-                cursor.execute('''
-                    UPDATE relationship_configurations 
-                    SET configuration = ?, updated_date = CURRENT_TIMESTAMP 
-                    WHERE name = ?
-                ''', (config_json, name))
-                message = f"Configuration '{name}' updated successfully"
-            else:
-                # Insert new configuration
-                cursor.execute('''
-                    INSERT INTO relationship_configurations (name, configuration) 
-                    VALUES (?, ?)
-                ''', (name, config_json))
-                message = f"Configuration '{name}' saved successfully"
-            
-            conn.commit()
-            conn.close()
+            try:
+                # Create configurations table if it doesn't exist; checked once
+                # per database file, so a recreated database is checked again
+                configuration_table_key = (db_path, _sqlite_file_identity(db_path))
+                if configuration_table_key not in self._configuration_tables:
+                    cursor.execute(_SQL_CREATE_CONFIGURATIONS)
+                    self._configuration_tables.add(configuration_table_key)
+                
+                config_json = orjson.dumps(config).decode() if orjson else json.dumps(config)
+                
+                # One write transaction, taken up front so a concurrent save of
+                # the same name cannot slip in between the update and the insert;
+                # the connection block commits, or rolls back on error
+                with conn:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    
+                    # Update existing configuration
+                    cursor.execute(_SQL_UPDATE_CONFIGURATION, (config_json, name))
+                    if cursor.rowcount:
+                        message = f"Configuration '{name}' updated successfully"
+                    else:
+                        # Insert new configuration
+                        cursor.execute(_SQL_INSERT_CONFIGURATION, (name, config_json))
+                        message = f"Configuration '{name}' saved successfully"
+            finally:
+                cursor.close()
             
             return {
                 'success': True,
@@ -1446,9 +1859,7 @@ class RelationshipService:
     def load_relationship_configuration(self, name: str) -> Dict[str, Any]:
         """Load a saved relationship configuration."""
         try:
-            result = db.session.execute(text(
-                "SELECT configuration FROM relationship_configurations WHERE name = :name"
-            ), {'name': name}).fetchone()
+            result = db.session.execute(_SQL_LOAD_CONFIGURATION, {'name': name}).fetchone()
             
             if not result:
                 return {
@@ -1456,8 +1867,7 @@ class RelationshipService:
                     'error': f"Configuration '{name}' not found"
                 }
             
-            import json
-            config = json.loads(result[0])
+            config = orjson.loads(result[0]) if orjson else json.loads(result[0])
             
             return {
                 'success': True,
@@ -1473,11 +1883,7 @@ class RelationshipService:
     def list_saved_configurations(self) -> Dict[str, Any]:
         """List all saved relationship configurations."""
         try:
-            results = db.session.execute(text('''
-                SELECT name, created_date, updated_date 
-                FROM relationship_configurations 
-                ORDER BY updated_date DESC
-            ''')).fetchall()
+            results = db.session.execute(_SQL_LIST_CONFIGURATIONS).fetchall()
             
             configurations = []
             for row in results:
@@ -1502,9 +1908,7 @@ class RelationshipService:
     def delete_relationship_configuration(self, name: str) -> Dict[str, Any]:
         """Delete a saved relationship configuration."""
         try:
-            result = db.session.execute(text(
-                "DELETE FROM relationship_configurations WHERE name = :name"
-            ), {'name': name})
+            result = db.session.execute(_SQL_DELETE_CONFIGURATION, {'name': name})
             
             if result.rowcount == 0:
                 return {
@@ -1533,8 +1937,8 @@ class RelationshipService:
             
             # Test query execution time
             start_time = time.time()
-            query = self._build_join_query(config, limit=1000)
-            result = db.session.execute(text(query))
+            query, params = self._build_join_query(config, limit=1000)
+            result = db.session.execute(text(query), params)
             rows = result.fetchall()
             execution_time = time.time() - start_time
             
@@ -1606,57 +2010,66 @@ class RelationshipService:
                     'error': f'Database {database} not found'
                 }
             
-            import sqlite3
-            import pandas as pd
-            
-            # First, execute the query to get results
-            conn = sqlite3.connect(db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            columns = [description[0] for description in cursor.description] if cursor.description else []
-            
-            if not rows:
-                conn.close()
-                return {
-                    'success': False,
-                    'error': 'Query returned no results'
-                }
-            
-            # Check if table already exists
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-            if cursor.fetchone():
-                conn.close()
+            # The name is spliced into the DDL, so it must be a plain identifier
+            if not _TABLE_NAME_RE.match(table_name):
                 return {
                     'success': False,
-                    'error': f'Table "{table_name}" already exists. Please choose a different name.'
+                    'error': f'Invalid table name "{table_name}"'
                 }
             
-            # Convert results to list of dictionaries
-            data = [dict(row) for row in rows]
-            
-            # Convert to pandas DataFrame for easier handling
-            df = pd.DataFrame(data)
-            
-            # Create table from DataFrame using pandas to_sql
-            df.to_sql(table_name, conn, index=False, if_exists='fail')
+            conn = _get_sqlite_connection(db_path)
+            cursor = conn.cursor()
             
-            conn.commit()
+            try:
+                # Check if table already exists
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+                if cursor.fetchone():
+                    return {
+                        'success': False,
+                        'error': f'Table "{table_name}" already exists. Please choose a different name.'
+                    }
+                
+                # Let SQLite copy the result rows into the new table itself
+                # instead of round-tripping them through Python and pandas
+                with conn:
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute(f'CREATE TABLE "{table_name}" AS {query.strip().rstrip(";")}')
+                    
+                    # First 5 rows as sample; only these ever reach Python
+                    cursor.execute(f'SELECT * FROM "{table_name}" LIMIT 5')
+                    columns = [description[0] for description in cursor.description]
+                    sample_data = [dict(zip(columns, row)) for row in cursor.fetchmany(5)]
+                    
+                    if not sample_data:
+                        # Roll the empty table back out
+                        conn.rollback()
+                        return {
+                            'success': False,
+                            'error': 'Query returned no results'
+                        }
+                    
+                    # A freshly filled table numbers its rows 1..N, so the
+                    # largest rowid is the row count, read from the b-tree edge
+                    # instead of a COUNT(*) scan; a result column may shadow
+                    # one of the rowid aliases, so take one that is free
+                    taken = {column.lower() for column in columns}
+                    rowid = next(alias for alias in ('rowid', '_rowid_', 'oid') if alias not in taken)
+                    cursor.execute(f'SELECT MAX({rowid}) FROM "{table_name}"')
+                    row_count = cursor.fetchone()[0]
+            finally:
+                cursor.close()
             
             # Get the newly created table info
+            self.invalidate_schema_cache()
             new_table_columns = self.get_table_columns(table_name, database)
             
-            conn.close()
-            
             return {
                 'success': True,
-                'message': f'Table "{table_name}" created successfully with {len(rows)} rows',
+                'message': f'Table "{table_name}" created successfully with {row_count} rows',
                 'table_name': table_name,
-                'row_count': len(rows),
+                'row_count': row_count,
                 'columns': new_table_columns,
-                'sample_data': data[:5]  # First 5 rows as sample
+                'sample_data': sample_data
             }
                 
         except Exception as e:
@@ -1665,13 +2078,20 @@ class RelationshipService:
                 'error': f'Error creating table: {str(e)}'
             }
     
-    def analyze_table_data(self, table_name: str, database: str = 'excel_data') -> Dict[str, Any]:
-        """Perform comprehensive analysis of table data."""
+    def analyze_table_data(self, table_name: str, database: str = 'excel_data',
+                           sample_rows: Optional[int] = _ANALYSIS_SAMPLE_ROWS) -> Dict[str, Any]:
+        """Perform comprehensive analysis of table data.
+        
+        At most ``sample_rows`` rows are loaded for the analyses; None reads
+        the whole table. ``row_count`` always reports the full table.
+        """
         try:
+            limit_clause = " LIMIT :sample_rows" if sample_rows else ""
+            limit_params = {'sample_rows': sample_rows} if sample_rows else {}
+            
             # Handle different database connections
             if database and database != 'excel_data':
                 # Connect to specific database
-                import sqlite3
                 db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', f'{database}.db')
                 
                 if not os.path.exists(db_path):
@@ -1680,24 +2100,31 @@ class RelationshipService:
                         'error': f'Database "{database}" not found'
                     }
                 
-                conn = sqlite3.connect(db_path)
-                conn.row_factory = sqlite3.Row  # This allows accessing columns by name
+                # This thread's cached connection, so repeat analyses skip
+                # reopening the file and re-running its setup pragmas
+                conn = _get_sqlite_connection(db_path)
                 
                 # Check if table exists
                 cursor = conn.cursor()
                 cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
                 if not cursor.fetchone():
-                    conn.close()
                     return {
                         'success': False,
                         'error': f'Table "{table_name}" not found in database "{database}"'
                     }
                 
+                quoted_table = '"' + table_name.replace('"', '""') + '"'
+                row_count = cursor.execute(f"SELECT COUNT(*) FROM {quoted_table}").fetchone()[0]
+                signature = (row_count, sample_rows, self._database_file_version(db_path))
+                cached = self._cached_analysis(database, table_name, signature)
+                if cached is not None:
+                    return cached
+                
                 # Get table data
-                df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+                df = pd.read_sql_query(f"SELECT * FROM {quoted_table}{limit_clause}", conn, params=limit_params)
                 
                 # Get column info from sqlite
-                cursor.execute(f"PRAGMA table_info({table_name})")
+                cursor.execute(f"PRAGMA table_info({quoted_table})")
                 columns_info = cursor.fetchall()
                 columns = [
                     {
@@ -1708,20 +2135,26 @@ class RelationshipService:
                     }
                     for col in columns_info
                 ]
-                
-                conn.close()
             else:
                 # Use default database connection
-                inspector = inspect(db.engine)
-                if table_name not in inspector.get_table_names():
+                if table_name not in self._existing_tables():
                     return {
                         'success': False,
                         'error': f'Table "{table_name}" not found'
                     }
                 
+                # Only file-backed SQLite databases can tell whether they changed
+                db_path = db.engine.url.database if db.engine.dialect.name == 'sqlite' else None
+                row_count = self._count_table_rows([table_name])[table_name]
+                signature = (row_count, sample_rows, self._database_file_version(db_path))
+                cached = self._cached_analysis(database, table_name, signature)
+                if cached is not None:
+                    return cached
+                
+                quoted_table = db.engine.dialect.identifier_preparer.quote(table_name)
                 with db.engine.connect() as connection:
                     # Get basic table info
-                    result = connection.execute(text(f"SELECT * FROM {table_name}"))
+                    result = connection.execute(text(f"SELECT * FROM {quoted_table}{limit_clause}"), limit_params)
                     rows = result.fetchall()
                     column_names = list(result.keys())
                     
@@ -1741,34 +2174,60 @@ class RelationshipService:
                     'error': 'Table is empty'
                 }
             
+            # Null, distinct and duplicate counts are shared by several of the
+            # analyses below, so the frame is scanned for them only once
+            stats = self._column_statistics(df)
+            # The numeric analyses share one copy of the numeric columns, and
+            # the correlation list and matrix are two views of one computation
+            numeric_df = df.select_dtypes(include=['number'])
+            corr_matrix = self._numeric_correlations(df, numeric_df)
+            
             # Perform comprehensive analysis
             analysis = {
                 'success': True,
                 'table_name': table_name,
                 'database': database,
-                'row_count': len(df),
+                'row_count': row_count,
+                'analyzed_rows': len(df),
                 'columns': columns,
-                'column_types': self._analyze_column_types(df),
-                'sample_data': self._convert_numpy_types(df.head(10).to_dict('records')),
-                'missing_analysis': self._analyze_missing_data(df),
-                'duplicate_analysis': self._analyze_duplicates(df),
-                'numeric_stats': self._analyze_numeric_stats(df),
-                'text_stats': self._analyze_text_stats(df),
-                'date_stats': self._analyze_date_stats(df),
-                'value_frequencies': self._analyze_value_frequencies(df),
-                'unique_analysis': self._analyze_unique_values(df),
-                'numeric_distributions': self._analyze_numeric_distributions(df),
-                'data_issues': self._detect_data_issues(df),
-                'quality_score': self._calculate_quality_score(df),
-                'text_patterns': self._analyze_text_patterns(df),
-                'trends': self._analyze_trends(df),
-                'anomalies': self._detect_anomalies(df),
-                'correlations': self._analyze_correlations(df),
-                'relationship_suggestions': self._suggest_relationships(df),
-                'correlation_matrix': self._create_correlation_matrix(df)
+                'sample_data': df.head(10).to_dict('records')
+            }
+            
+            # The analyses only read the frame and do not touch the database,
+            # so on large tables they run side by side in worker threads
+            analyses = {
+                'column_types': (self._analyze_column_types, df),
+                'missing_analysis': (self._analyze_missing_data, df, stats),
+                'duplicate_analysis': (self._analyze_duplicates, df, stats),
+                'numeric_stats': (self._analyze_numeric_stats, df, numeric_df),
+                'text_stats': (self._analyze_text_stats, df),
+                'date_stats': (self._analyze_date_stats, df),
+                'value_frequencies': (self._analyze_value_frequencies, df),
+                'unique_analysis': (self._analyze_unique_values, df, stats),
+                'numeric_distributions': (self._analyze_numeric_distributions, df, numeric_df),
+                'data_issues': (self._detect_data_issues, df, stats),
+                'quality_score': (self._calculate_quality_score, df, stats),
+                'text_patterns': (self._analyze_text_patterns, df),
+                'trends': (self._analyze_trends, df, numeric_df),
+                'anomalies': (self._detect_anomalies, df, numeric_df),
+                'correlations': (self._analyze_correlations, df, corr_matrix),
+                'relationship_suggestions': (self._suggest_relationships, df, stats),
+                'correlation_matrix': (self._create_correlation_matrix, df, corr_matrix)
             }
+            if df.size < _PARALLEL_ANALYSIS_MIN_CELLS:
+                for key, (func, *args) in analyses.items():
+                    analysis[key] = func(*args)
+            else:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    futures = {key: executor.submit(func, *args) for key, (func, *args) in analyses.items()}
+                    for key, future in futures.items():
+                        analysis[key] = future.result()
+            
+            if signature[-1] is not None:
+                self._store_analysis(database, table_name, signature, analysis)
             
-            return self._convert_numpy_types(analysis)
+            # NumPy scalars are converted by the app's JSON provider on output
+            return analysis
                 
         except Exception as e:
             return {
@@ -1776,33 +2235,83 @@ class RelationshipService:
                 'error': f'Error analyzing table: {str(e)}'
             }
     
+    def _database_file_version(self, db_path: Optional[str]) -> Optional[Tuple[int, ...]]:
+        """Return modification stamps of a SQLite file and its WAL, or None without a file."""
+        if not db_path or db_path == ':memory:':
+            return None
+        
+        # Committed writes land in the -wal file until a checkpoint copies
+        # them into the database file, so both are stamped
+        version = []
+        for path in (db_path, db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                version.extend((0, 0))
+            else:
+                version.extend((stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+    
+    def _cached_analysis(self, database: str, table_name: str, signature: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a recent analysis of the table if its row count and file stamps still match.
+        
+        The result is a shallow copy; its nested statistics are shared with
+        the cache and must not be modified.
+        """
+        if signature[-1] is None:
+            return None
+        key = (database, table_name)
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached and cached[1] == signature and time.time() - cached[0] < self._cache_timeout:
+                self._analysis_cache.move_to_end(key)
+                return dict(cached[2])
+        return None
+    
+    def _store_analysis(self, database: str, table_name: str, signature: Tuple,
+                        analysis: Dict[str, Any]) -> None:
+        """Cache a finished analysis, evicting expired and least recently used entries."""
+        key = (database, table_name)
+        now = time.time()
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = (now, signature, dict(analysis))
+            self._analysis_cache.move_to_end(key)
+            expired = [cache_key for cache_key, (stored_at, _, _) in self._analysis_cache.items()
+                       if now - stored_at >= self._cache_timeout]
+            for cache_key in expired:
+                del self._analysis_cache[cache_key]
+            while len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+    
     def _analyze_column_types(self, df: pd.DataFrame) -> Dict[str, int]:
         """Analyze column data types distribution."""
-        type_counts = {}
-        for column in df.columns:
-            dtype_str = str(df[column].dtype)
-            if dtype_str.startswith('int') or dtype_str.startswith('float'):
-                type_name = 'Numeric'
-            elif dtype_str.startswith('object'):
-                type_name = 'Text'
-            elif dtype_str.startswith('datetime'):
-                type_name = 'Date/Time'
-            elif dtype_str.startswith('bool'):
-                type_name = 'Boolean'
-            else:
-                type_name = 'Other'
-            
-            type_counts[type_name] = type_counts.get(type_name, 0) + 1
-        
-        return type_counts
+        # Classify on the dtype kind code rather than parsing the dtype name;
+        # pandas extension dtypes (Int64, string, category) count as Other,
+        # except timezone-aware datetimes
+        type_names = df.dtypes.map(
+            lambda dtype: 'Date/Time' if dtype.kind == 'M'
+            else _DTYPE_KIND_NAMES.get(dtype.kind, 'Other') if isinstance(dtype, np.dtype)
+            else 'Other'
+        )
+        return {type_name: int(count) for type_name, count in type_names.value_counts(sort=False).items()}
     
-    def _analyze_missing_data(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    def _column_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Count nulls and distinct values per column and duplicate rows in one place."""
+        return {
+            'null_counts': df.isna().sum(),
+            'unique_counts': df.nunique(),
+            'duplicate_rows': int(df.duplicated().sum())
+        }
+    
+    def _analyze_missing_data(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
         """Analyze missing data patterns."""
+        if stats is None:
+            stats = self._column_statistics(df)
+        
         missing_analysis = {}
         total_rows = len(df)
         
-        for column in df.columns:
-            null_count = df[column].isnull().sum()
+        for column, null_count in stats['null_counts'].items():
             missing_analysis[column] = {
                 'count': int(null_count),
                 'percentage': (null_count / total_rows) * 100 if total_rows > 0 else 0
@@ -1810,9 +2319,12 @@ class RelationshipService:
         
         return missing_analysis
     
-    def _analyze_duplicates(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_duplicates(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze duplicate data."""
-        duplicate_rows = df.duplicated().sum()
+        if stats is None:
+            stats = self._column_statistics(df)
+        
+        duplicate_rows = stats['duplicate_rows']
         total_rows = len(df)
         
         return {
@@ -1821,23 +2333,30 @@ class RelationshipService:
             'unique_rows': total_rows - duplicate_rows
         }
     
-    def _analyze_numeric_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    def _analyze_numeric_stats(self, df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
         """Analyze numeric column statistics."""
+        if numeric_df is None:
+            numeric_df = df.select_dtypes(include=['number'])
+        
         numeric_stats = {}
-        numeric_columns = df.select_dtypes(include=['number']).columns
+        if len(numeric_df.columns) == 0:
+            return numeric_stats
         
-        for column in numeric_columns:
-            series = df[column].dropna()
-            if len(series) > 0:
+        # One describe() call yields every statistic for all numeric columns
+        summary = numeric_df.describe(percentiles=[.25, .5, .75])
+        
+        for column, column_stats in summary.to_dict().items():
+            count = column_stats['count']
+            if count > 0:
                 numeric_stats[column] = {
-                    'mean': float(series.mean()),
-                    'median': float(series.median()),
-                    'std': float(series.std()) if len(series) > 1 else 0,
-                    'min': float(series.min()),
-                    'max': float(series.max()),
-                    'range': float(series.max() - series.min()),
-                    'q25': float(series.quantile(0.25)),
-                    'q75': float(series.quantile(0.75))
+                    'mean': float(column_stats['mean']),
+                    'median': float(column_stats['50%']),
+                    'std': float(column_stats['std']) if count > 1 else 0,
+                    'min': float(column_stats['min']),
+                    'max': float(column_stats['max']),
+                    'range': float(column_stats['max'] - column_stats['min']),
+                    'q25': float(column_stats['25%']),
+                    'q75': float(column_stats['75%'])
                 }
         
         return numeric_stats
@@ -1846,9 +2365,13 @@ class RelationshipService:
         """Analyze text column statistics."""
         text_stats = {}
         text_columns = df.select_dtypes(include=['object']).columns
+        # Arrow strings measure, count and compare in pyarrow compute kernels
+        # instead of calling into every Python str; values are stringified
+        # the same way either way
+        text_dtype = pd.StringDtype('pyarrow') if pyarrow is not None else str
         
         for column in text_columns:
-            series = df[column].dropna().astype(str)
+            series = df[column].dropna().astype(text_dtype)
             if len(series) > 0:
                 lengths = series.str.len()
                 text_stats[column] = {
@@ -1864,13 +2387,23 @@ class RelationshipService:
     def _analyze_date_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
         """Analyze date/time column statistics."""
         date_stats = {}
+        min_valid = len(df) * 0.5
         
-        # Try to identify date columns
-        for column in df.columns:
+        # Only text columns can hold date strings; numeric columns would
+        # parse as offsets from the epoch, and datetime columns need no parsing
+        for column in df.select_dtypes(include=['object', 'datetime', 'datetimetz']).columns:
             try:
-                # Try to convert to datetime
-                date_series = pd.to_datetime(df[column], errors='coerce').dropna()
-                if len(date_series) > len(df) * 0.5:  # If more than 50% are valid dates
+                series = df[column]
+                # Skip the parse when too few values are present to pass the threshold
+                if series.count() <= min_valid:
+                    continue
+                
+                if pd.api.types.is_datetime64_any_dtype(series.dtype):
+                    date_series = series.dropna()
+                else:
+                    # Try to convert to datetime
+                    date_series = pd.to_datetime(series, errors='coerce').dropna()
+                if len(date_series) > min_valid:  # If more than 50% are valid dates
                     date_stats[column] = {
                         'min_date': str(date_series.min().date()),
                         'max_date': str(date_series.max().date()),
@@ -1886,19 +2419,31 @@ class RelationshipService:
         frequencies = {}
         
         for column in df.columns:
-            # Limit to top 10 most frequent values
-            value_counts = df[column].value_counts().head(10)
-            frequencies[column] = {str(k): int(v) for k, v in value_counts.items()}
+            # One hash pass numbers the distinct values in order of first
+            # appearance (missing values get -1) and bincount tallies them
+            codes, uniques = pd.factorize(df[column])
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            
+            # Limit to top 10 most frequent values without sorting the rest;
+            # ties keep their order of first appearance
+            if len(counts) > 10:
+                top = np.argpartition(-counts, 9)[:10]
+            else:
+                top = np.arange(len(counts))
+            top = top[np.lexsort((top, -counts[top]))]
+            frequencies[column] = {str(uniques[i]): int(counts[i]) for i in top}
         
         return frequencies
     
-    def _analyze_unique_values(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    def _analyze_unique_values(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
         """Analyze unique value patterns."""
+        if stats is None:
+            stats = self._column_statistics(df)
+        
         unique_analysis = {}
         total_rows = len(df)
         
-        for column in df.columns:
-            unique_count = df[column].nunique()
+        for column, unique_count in stats['unique_counts'].items():
             unique_analysis[column] = {
                 'unique_count': int(unique_count),
                 'uniqueness_ratio': unique_count / total_rows if total_rows > 0 else 0
@@ -1906,13 +2451,14 @@ class RelationshipService:
         
         return unique_analysis
     
-    def _analyze_numeric_distributions(self, df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    def _analyze_numeric_distributions(self, df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
         """Analyze numeric distributions."""
-        distributions = {}
-        numeric_columns = df.select_dtypes(include=['number']).columns
+        if numeric_df is None:
+            numeric_df = df.select_dtypes(include=['number'])
         
-        for column in numeric_columns:
-            series = df[column].dropna()
+        distributions = {}
+        for column in numeric_df.columns:
+            series = numeric_df[column].dropna()
             if len(series) > 1:
                 try:
                     from scipy import stats
@@ -1931,23 +2477,28 @@ class RelationshipService:
         
         return distributions
     
-    def _detect_data_issues(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_data_issues(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Detect various data quality issues."""
+        if stats is None:
+            stats = self._column_statistics(df)
+        
         issues = []
         
         # Check for columns with high missing data
-        for column in df.columns:
-            missing_pct = (df[column].isnull().sum() / len(df)) * 100
-            if missing_pct > 50:
-                issues.append({
-                    'type': 'High Missing Data',
-                    'severity': 'high',
-                    'description': f'Column "{column}" has {missing_pct:.1f}% missing values',
-                    'count': int(df[column].isnull().sum())
-                })
+        null_counts = stats['null_counts']
+        if null_counts.any():
+            for column, missing_count in null_counts.items():
+                missing_pct = (missing_count / len(df)) * 100
+                if missing_pct > 50:
+                    issues.append({
+                        'type': 'High Missing Data',
+                        'severity': 'high',
+                        'description': f'Column "{column}" has {missing_pct:.1f}% missing values',
+                        'count': int(missing_count)
+                    })
         
         # Check for duplicate rows
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = stats['duplicate_rows']
         if duplicate_count > 0:
             issues.append({
                 'type': 'Duplicate Rows',
@@ -1957,8 +2508,8 @@ class RelationshipService:
             })
         
         # Check for columns with single unique value
-        for column in df.columns:
-            if df[column].nunique() == 1:
+        for column, unique_count in stats['unique_counts'].items():
+            if unique_count == 1:
                 issues.append({
                     'type': 'Constant Column',
                     'severity': 'low',
@@ -1968,14 +2519,17 @@ class RelationshipService:
         
         return issues
     
-    def _calculate_quality_score(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _calculate_quality_score(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Calculate overall data quality score."""
+        if stats is None:
+            stats = self._column_statistics(df)
+        
         total_rows = len(df)
         total_cells = total_rows * len(df.columns)
         
         # Calculate various quality metrics
-        missing_cells = df.isnull().sum().sum()
-        duplicate_rows = df.duplicated().sum()
+        missing_cells = int(stats['null_counts'].sum())
+        duplicate_rows = stats['duplicate_rows']
         
         # Completeness score (100% - missing percentage)
         completeness = ((total_cells - missing_cells) / total_cells) * 100 if total_cells > 0 else 0
@@ -2006,22 +2560,21 @@ class RelationshipService:
         for column in text_columns:
             series = df[column].dropna().astype(str)
             if len(series) > 0:
-                # Simple pattern analysis
-                pattern_counts = {}
-                for value in series.head(100):  # Limit to first 100 values
-                    # Extract basic patterns
-                    if value.isdigit():
-                        pattern = 'All digits'
-                    elif value.isalpha():
-                        pattern = 'All letters'
-                    elif '@' in value:
-                        pattern = 'Email-like'
-                    elif len(value.split()) > 1:
-                        pattern = 'Multiple words'
-                    else:
-                        pattern = 'Mixed/Other'
-                    
-                    pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+                # Simple pattern analysis over the first 100 values; each test
+                # runs as one vectorized string operation and the first
+                # matching pattern wins, as in a per-value if/elif chain
+                sample = series.head(100)
+                pattern = np.select(
+                    [
+                        sample.str.isdigit().to_numpy(dtype=bool),
+                        sample.str.isalpha().to_numpy(dtype=bool),
+                        sample.str.contains('@', regex=False).to_numpy(dtype=bool),
+                        sample.str.contains(_MULTI_WORD_RE).to_numpy(dtype=bool)
+                    ],
+                    ['All digits', 'All letters', 'Email-like', 'Multiple words'],
+                    default='Mixed/Other'
+                )
+                pattern_counts = {name: int(count) for name, count in pd.Series(pattern).value_counts(sort=False).items()}
                 
                 patterns[column] = [
                     {'pattern': k, 'count': v} 
@@ -2030,20 +2583,27 @@ class RelationshipService:
         
         return patterns
     
-    def _analyze_trends(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _analyze_trends(self, df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """Analyze data trends."""
+        if numeric_df is None:
+            numeric_df = df.select_dtypes(include=['number'])
+        
         trends = []
         
-        # Simple trend analysis for numeric columns
-        numeric_columns = df.select_dtypes(include=['number']).columns
-        for column in numeric_columns:
-            series = df[column].dropna()
+        # Simple trend analysis for numeric columns, stepping between
+        # consecutive non-missing values of the whole numeric block
+        values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+        for index, column in enumerate(numeric_df.columns):
+            series = values[:, index]
+            series = series[~np.isnan(series)]
             if len(series) > 1:
-                # Check if data is increasing or decreasing
-                diff = series.diff().dropna()
+                # Check if data is increasing or decreasing; inf - inf steps
+                # are undefined and left out
+                diff = np.diff(series)
+                diff = diff[~np.isnan(diff)]
                 if len(diff) > 0:
-                    increasing = (diff > 0).sum()
-                    decreasing = (diff < 0).sum()
+                    increasing = np.count_nonzero(diff > 0)
+                    decreasing = np.count_nonzero(diff < 0)
                     
                     if increasing > decreasing * 1.5:
                         trends.append({
@@ -2060,77 +2620,96 @@ class RelationshipService:
         
         return trends
     
-    def _detect_anomalies(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _detect_anomalies(self, df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
         """Detect anomalies in the data."""
+        if numeric_df is None:
+            numeric_df = df.select_dtypes(include=['number'])
+        
         anomalies = []
         
-        # Detect outliers in numeric columns
-        numeric_columns = df.select_dtypes(include=['number']).columns
-        for column in numeric_columns:
-            series = df[column].dropna()
-            if len(series) > 4:
-                Q1 = series.quantile(0.25)
-                Q3 = series.quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = series[(series < lower_bound) | (series > upper_bound)]
-                if len(outliers) > 0:
+        # Detect outliers in numeric columns with more than four values; the
+        # quartiles of every column come from one nanpercentile call over the
+        # numeric block, and NaN compares False so missing values never count
+        numeric_df = numeric_df.loc[:, numeric_df.notna().sum().to_numpy() > 4]
+        if len(numeric_df.columns) > 0:
+            values = numeric_df.to_numpy(dtype=float, na_value=np.nan)
+            q1, q3 = np.nanpercentile(values, [25, 75], axis=0)
+            iqr = q3 - q1
+            lower_bound = q1 - 1.5 * iqr
+            upper_bound = q3 + 1.5 * iqr
+            outlier_counts = ((values < lower_bound) | (values > upper_bound)).sum(axis=0)
+            
+            for column, count in zip(numeric_df.columns, outlier_counts.tolist()):
+                if count > 0:
                     anomalies.append({
                         'type': 'Statistical Outliers',
                         'column': column,
-                        'description': f'Found {len(outliers)} outliers using IQR method',
-                        'count': len(outliers)
+                        'description': f'Found {count} outliers using IQR method',
+                        'count': count
                     })
         
         return anomalies
     
-    def _analyze_correlations(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Analyze correlations between numeric columns."""
-        correlations = []
-        numeric_df = df.select_dtypes(include=['number'])
+    def _numeric_correlations(self, df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+        """Correlate the numeric columns pairwise; None with fewer than two of them."""
+        if numeric_df is None:
+            numeric_df = df.select_dtypes(include=['number'])
         
         if len(numeric_df.columns) > 1:
-            corr_matrix = numeric_df.corr()
-            
-            # Extract significant correlations
-            for i, col1 in enumerate(corr_matrix.columns):
-                for j, col2 in enumerate(corr_matrix.columns):
-                    if i < j:  # Avoid duplicates
-                        corr_value = corr_matrix.loc[col1, col2]
-                        if not pd.isna(corr_value) and abs(corr_value) > 0.3:
-                            correlations.append({
-                                'column1': col1,
-                                'column2': col2,
-                                'value': float(corr_value)
-                            })
+            return numeric_df.corr()
+        
+        return None
+    
+    def _analyze_correlations(self, df: pd.DataFrame, corr_matrix: Optional[pd.DataFrame] = None) -> List[Dict[str, Any]]:
+        """Analyze correlations between numeric columns."""
+        if corr_matrix is None:
+            corr_matrix = self._numeric_correlations(df)
+        
+        correlations = []
+        if corr_matrix is not None:
+            # Extract significant correlations from the upper triangle, row by
+            # row; NaN compares False, so undefined correlations drop out
+            values = corr_matrix.to_numpy()
+            rows, cols = np.triu_indices(len(corr_matrix.columns), k=1)
+            pair_values = values[rows, cols]
+            significant = np.abs(pair_values) > 0.3
+            
+            columns = corr_matrix.columns
+            for i, j, corr_value in zip(rows[significant], cols[significant], pair_values[significant]):
+                correlations.append({
+                    'column1': columns[i],
+                    'column2': columns[j],
+                    'value': float(corr_value)
+                })
         
         return correlations
     
-    def _suggest_relationships(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _suggest_relationships(self, df: pd.DataFrame, stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Suggest potential relationships in the data."""
+        if stats is None:
+            stats = self._column_statistics(df)
+        
         suggestions = []
         
-        # Look for potential foreign key relationships
-        for column in df.columns:
-            unique_ratio = df[column].nunique() / len(df)
-            
-            if 0.1 < unique_ratio < 0.9:  # Not too unique, not too repetitive
-                suggestions.append({
-                    'type': 'Potential Lookup Column',
-                    'description': f'Column "{column}" might be a foreign key or categorical variable',
-                    'confidence': int((1 - abs(unique_ratio - 0.5)) * 100)
-                })
+        # Look for potential foreign key relationships among the columns that
+        # are not too unique and not too repetitive
+        unique_ratios = stats['unique_counts'] / len(df)
+        candidates = unique_ratios[(unique_ratios > 0.1) & (unique_ratios < 0.9)]
+        for column, unique_ratio in candidates.items():
+            suggestions.append({
+                'type': 'Potential Lookup Column',
+                'description': f'Column "{column}" might be a foreign key or categorical variable',
+                'confidence': int((1 - abs(unique_ratio - 0.5)) * 100)
+            })
         
         return suggestions
     
-    def _create_correlation_matrix(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _create_correlation_matrix(self, df: pd.DataFrame, corr_matrix: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
         """Create a correlation matrix for numeric columns."""
-        numeric_df = df.select_dtypes(include=['number'])
+        if corr_matrix is None:
+            corr_matrix = self._numeric_correlations(df)
         
-        if len(numeric_df.columns) > 1:
-            corr_matrix = numeric_df.corr()
+        if corr_matrix is not None:
             return {
                 'columns': list(corr_matrix.columns),
                 'data': corr_matrix.values.tolist()
@@ -7,27 +7,186 @@ from models import db
 from sqlalchemy import text
 from datetime import datetime, timedelta
 import logging
+import threading
+import time
 from .currency_service import currency_service
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round from the cursor while result dicts are built, so
+# a large result is never held as a full row list next to its dicts
+_ROW_BATCH_SIZE = 500
+
+# Indexes for the columns the inventory queries filter, group and sort on;
+# Stock comes from the Excel import, so the service adds them itself
+_STOCK_INDEXES = {
+    'idx_stock_qty_reorder': 'Stock (quantite_en_stock, seuil_de_reappro_min)',
+    'idx_stock_category': 'Stock (categorie_article)',
+    'idx_stock_designation': 'Stock (designation_1)',
+}
+
+# Full-text index over the searched Stock columns. The trigram tokenizer
+# makes a quoted MATCH find the same substrings as LIKE '%term%', for terms
+# of three or more characters; the triggers keep it in step with Stock
+_STOCK_FTS_CREATE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS Stock_fts USING fts5(
+        reference_article, designation_1, designation_2, categorie_article,
+        content='Stock', content_rowid='id', tokenize='trigram'
+    )
+"""
+_STOCK_FTS_TRIGGERS = {
+    'Stock_fts_ai': """
+        CREATE TRIGGER IF NOT EXISTS Stock_fts_ai AFTER INSERT ON Stock BEGIN
+            INSERT INTO Stock_fts (rowid, reference_article, designation_1, designation_2, categorie_article)
+            VALUES (new.id, new.reference_article, new.designation_1, new.designation_2, new.categorie_article);
+        END
+    """,
+    'Stock_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS Stock_fts_ad AFTER DELETE ON Stock BEGIN
+            INSERT INTO Stock_fts (Stock_fts, rowid, reference_article, designation_1, designation_2, categorie_article)
+            VALUES ('delete', old.id, old.reference_article, old.designation_1, old.designation_2, old.categorie_article);
+        END
+    """,
+    'Stock_fts_au': """
+        CREATE TRIGGER IF NOT EXISTS Stock_fts_au
+        AFTER UPDATE OF id, reference_article, designation_1, designation_2, categorie_article ON Stock BEGIN
+            INSERT INTO Stock_fts (Stock_fts, rowid, reference_article, designation_1, designation_2, categorie_article)
+            VALUES ('delete', old.id, old.reference_article, old.designation_1, old.designation_2, old.categorie_article);
+            INSERT INTO Stock_fts (rowid, reference_article, designation_1, designation_2, categorie_article)
+            VALUES (new.id, new.reference_article, new.designation_1, new.designation_2, new.categorie_article);
+        END
+    """,
+}
+
 class SparePartsService:
     """Service for spare parts inventory management using the Stock table."""
     
     def __init__(self):
+        """Initialize the spare parts service."""
         self.currency_service = currency_service
+        # Cleared when this SQLite build lacks FTS5 or its trigram tokenizer
+        self._stock_fts_supported = True
+        # Dashboard aggregates keyed on the method name, each stored as
+        # (timestamp, stock version, result). Stock writes through this
+        # service, Stock imports (via prepare_stock_table) and the generic
+        # record edit routes bump the version; any other writer waits out
+        # the timeout
+        self._read_cache = {}
+        self._read_cache_lock = threading.Lock()
+        self._read_cache_timeout = 60  # seconds
+        self._stock_version = 0
     
-    def format_price(self, amount, show_eur=True):
+    def format_price(self, amount, show_eur=True, rate=None):
         """Format price with CFA and optional EUR conversion."""
-        return self.currency_service.format_currency(amount, 'XOF', show_eur)
+        return self.currency_service.format_currency(amount, 'XOF', show_eur, rate=rate)
     
-    def convert_to_eur(self, cfa_amount):
+    def convert_to_eur(self, cfa_amount, rate=None):
         """Convert CFA amount to EUR."""
-        return self.currency_service.convert_to_eur(cfa_amount)
+        return self.currency_service.convert_to_eur(cfa_amount, rate=rate)
     
-    def __init__(self):
-        """Initialize the spare parts service."""
-        pass
+    def _get_cached_read(self, key):
+        """Return a cached aggregate if it is recent and no stock write happened since."""
+        with self._read_cache_lock:
+            cached = self._read_cache.get(key)
+        if (cached and cached[1] == self._stock_version and
+                time.time() - cached[0] < self._read_cache_timeout):
+            return cached[2]
+        return None
+    
+    def _store_cached_read(self, key, value, stock_version):
+        """Remember an aggregate computed while the stock was at ``stock_version``."""
+        with self._read_cache_lock:
+            self._read_cache[key] = (time.time(), stock_version, value)
+    
+    def invalidate_cached_reads(self):
+        """Make every cached aggregate stale after a stock change."""
+        with self._read_cache_lock:
+            self._stock_version += 1
+            self._read_cache.clear()
+    
+    def prepare_stock_table(self):
+        """Create any missing Stock indexes and build the Stock_fts search index.
+        
+        Run at startup and after each Stock import, since an import may
+        replace the table along with its indexes and triggers; the read
+        methods never write. Works on its own connections rather than the
+        request session. Cached dashboard aggregates are dropped first, as
+        the import has changed the stock under them.
+        """
+        self.invalidate_cached_reads()
+        
+        with db.engine.connect() as connection:
+            result = connection.execute(text("""
+                SELECT type, name FROM sqlite_master 
+                WHERE tbl_name = 'Stock' COLLATE NOCASE
+            """))
+            existing = result.fetchall()
+        if not any(row[0] == 'table' for row in existing):
+            return
+        
+        existing_names = {row[1] for row in existing}
+        self._create_stock_indexes(existing_names)
+        self._build_stock_fts(existing_names)
+    
+    def _create_stock_indexes(self, existing_names):
+        """Create the missing Stock indexes, refreshing statistics with ANALYZE if any were."""
+        missing = [name for name in _STOCK_INDEXES if name not in existing_names]
+        if not missing:
+            return
+        
+        try:
+            with db.engine.begin() as connection:
+                for name in missing:
+                    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {_STOCK_INDEXES[name]}"))
+                connection.execute(text("ANALYZE Stock"))
+        except Exception as e:
+            logger.warning(f"Could not create Stock indexes: {e}")
+    
+    def _build_stock_fts(self, existing_names):
+        """Create and rebuild Stock_fts unless its triggers already keep it in step.
+        
+        Replacing Stock on re-import drops its triggers along with it, as
+        does suspend_stock_search_index(), so missing triggers mean the
+        full-text index has to be rebuilt.
+        """
+        if all(name in existing_names for name in _STOCK_FTS_TRIGGERS):
+            return
+        
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(text(_STOCK_FTS_CREATE))
+                for statement in _STOCK_FTS_TRIGGERS.values():
+                    connection.execute(text(statement))
+                connection.execute(text("INSERT INTO Stock_fts (Stock_fts) VALUES ('rebuild')"))
+        except Exception as e:
+            if 'fts5' in str(e) or 'tokenizer' in str(e):
+                self._stock_fts_supported = False
+            logger.warning(f"Full-text search unavailable, using LIKE: {e}")
+    
+    def suspend_stock_search_index(self):
+        """Drop the Stock_fts triggers ahead of a bulk import into Stock.
+        
+        The import's delete and inserts then skip one full-text write per
+        row; search falls back to LIKE until prepare_stock_table() rebuilds
+        the index once the import is done.
+        """
+        try:
+            with db.engine.begin() as connection:
+                for name in _STOCK_FTS_TRIGGERS:
+                    connection.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        except Exception as e:
+            logger.warning(f"Could not drop Stock_fts triggers: {e}")
+    
+    def _stock_fts_ready(self):
+        """Check, without writing, that Stock_fts is built and its triggers are in place."""
+        if not self._stock_fts_supported:
+            return False
+        
+        result = db.session.execute(text("""
+            SELECT COUNT(*) FROM sqlite_master 
+            WHERE type = 'trigger' AND name IN ('Stock_fts_ai', 'Stock_fts_ad', 'Stock_fts_au')
+        """))
+        return result.scalar() == len(_STOCK_FTS_TRIGGERS)
     
     def get_spare_parts_inventory(self, low_stock_only=False, out_of_stock_only=False, limit=100, offset=0):
         """Get spare parts inventory from the Stock table."""
@@ -63,38 +222,44 @@ class SparePartsService:
             query += " ORDER BY designation_1 ASC LIMIT :limit OFFSET :offset"
             params.update({"limit": limit, "offset": offset})
             
+            # One exchange rate lookup for the whole page rather than one per
+            # converted or formatted amount; taken before the query, since a
+            # stale rate can mean HTTP requests that would otherwise hold the
+            # cursor and its read transaction open
+            rate = self.currency_service.get_exchange_rate()
+            
             result = db.session.execute(text(query), params)
-            rows = result.fetchall()
             
             # Convert to list of dictionaries
             spare_parts = []
-            for row in rows:
-                unit_cost = row[9] or 0.0
-                quantity = row[5] or 0
+            for row in result.yield_per(_ROW_BATCH_SIZE).mappings():
+                unit_cost = row['unit_cost'] or 0.0
+                quantity = row['quantity_on_hand'] or 0
+                reorder_level = row['reorder_level'] or 0
                 total_value = unit_cost * quantity
                 
                 spare_parts.append({
-                    'id': row[0],
-                    'part_number': row[1] or '',
-                    'part_name': row[2] or '',
-                    'description': row[3] or '',
-                    'category': row[4] or '',
+                    'id': row['id'],
+                    'part_number': row['part_number'] or '',
+                    'part_name': row['part_name'] or '',
+                    'description': row['description'] or '',
+                    'category': row['category'] or '',
                     'quantity_on_hand': quantity,
-                    'reorder_level': row[6] or 0,
-                    'max_quantity': row[7] or 0,
-                    'safety_stock': row[8] or 0,
+                    'reorder_level': reorder_level,
+                    'max_quantity': row['max_quantity'] or 0,
+                    'safety_stock': row['safety_stock'] or 0,
                     'unit_cost': unit_cost,
-                    'unit_cost_formatted': self.format_price(unit_cost),
+                    'unit_cost_formatted': self.format_price(unit_cost, rate=rate),
                     'total_value': total_value,
-                    'total_value_formatted': self.format_price(total_value),
-                    'unit_cost_eur': self.convert_to_eur(unit_cost),
-                    'total_value_eur': self.convert_to_eur(total_value),
-                    'unit_of_measure': row[10] or '',
-                    'location': row[11] or '',
-                    'last_received_date': row[12] or '',
-                    'last_issued_date': row[13] or '',
-                    'below_minimum': row[14] or '',
-                    'status': 'Critical' if quantity <= (row[6] or 0) else 'Normal'
+                    'total_value_formatted': self.format_price(total_value, rate=rate),
+                    'unit_cost_eur': self.convert_to_eur(unit_cost, rate=rate),
+                    'total_value_eur': self.convert_to_eur(total_value, rate=rate),
+                    'unit_of_measure': row['unit_of_measure'] or '',
+                    'location': row['location'] or '',
+                    'last_received_date': row['last_received_date'] or '',
+                    'last_issued_date': row['last_issued_date'] or '',
+                    'below_minimum': row['below_minimum'] or '',
+                    'status': 'Critical' if quantity <= reorder_level else 'Normal'
                 })
             
             return spare_parts
@@ -136,22 +301,18 @@ class SparePartsService:
             """
             
             result = db.session.execute(text(query), {"limit": limit})
-            rows = result.fetchall()
-            
-            critical_parts = []
-            for row in rows:
-                critical_parts.append({
-                    'id': row[0],
-                    'part_number': row[1] or '',
-                    'part_name': row[2] or '',
-                    'description': row[3] or '',
-                    'category': row[4] or '',
-                    'quantity_on_hand': row[5] or 0,
-                    'reorder_level': row[6] or 0,
-                    'unit_cost': row[7] or 0.0,
-                    'location': row[8] or '',
-                    'status': row[9]
-                })
+            critical_parts = [{
+                'id': row['id'],
+                'part_number': row['part_number'] or '',
+                'part_name': row['part_name'] or '',
+                'description': row['description'] or '',
+                'category': row['category'] or '',
+                'quantity_on_hand': row['quantity_on_hand'] or 0,
+                'reorder_level': row['reorder_level'] or 0,
+                'unit_cost': row['unit_cost'] or 0.0,
+                'location': row['location'] or '',
+                'status': row['status']
+            } for row in result.yield_per(_ROW_BATCH_SIZE).mappings()]
             
             return critical_parts
             
@@ -165,56 +326,46 @@ class SparePartsService:
     
     def get_spare_parts_statistics(self):
         """Get comprehensive spare parts statistics from Stock table."""
+        cached = self._get_cached_read('statistics')
+        if cached is not None:
+            return cached
+        # Taken before querying, so a write that lands meanwhile leaves the
+        # stored result already stale
+        stock_version = self._stock_version
+        
         try:
             stats = {}
             
-            # Total parts count
-            result = db.session.execute(text("SELECT COUNT(*) FROM Stock"))
-            stats['total_parts'] = result.scalar() or 0
-            
-            # Critical stock count (at or below reorder level)
+            # All scalar figures come from one scan of the Stock table; each
+            # CASE counts the rows a separate filtered COUNT used to select,
+            # and SUM/AVG already skip the NULLs the old WHERE clauses excluded
             result = db.session.execute(text("""
-                SELECT COUNT(*) FROM Stock 
-                WHERE quantite_en_stock <= seuil_de_reappro_min
-                AND seuil_de_reappro_min > 0
-            """))
-            stats['critical_stock'] = result.scalar() or 0
-            
-            # Out of stock count
-            result = db.session.execute(text("""
-                SELECT COUNT(*) FROM Stock 
-                WHERE quantite_en_stock = 0
-            """))
-            stats['out_of_stock'] = result.scalar() or 0
-            
-            # Total inventory value
-            result = db.session.execute(text("""
-                SELECT SUM(quantite_en_stock * pmp) 
+                SELECT 
+                    COUNT(*) as total_parts,
+                    -- Critical stock (at or below reorder level)
+                    SUM(CASE WHEN quantite_en_stock <= seuil_de_reappro_min
+                              AND seuil_de_reappro_min > 0 THEN 1 ELSE 0 END) as critical_stock,
+                    SUM(CASE WHEN quantite_en_stock = 0 THEN 1 ELSE 0 END) as out_of_stock,
+                    SUM(quantite_en_stock * pmp) as total_value,
+                    -- Average days since last movement
+                    AVG(
+                        CASE 
+                            WHEN date_derniere_sortie IS NOT NULL AND date_derniere_sortie != ''
+                            THEN julianday('now') - julianday(date_derniere_sortie)
+                            ELSE NULL
+                        END
+                    ) as avg_days_since_movement,
+                    SUM(CASE WHEN quantite_en_stock < stock_securite
+                              AND stock_securite > 0 THEN 1 ELSE 0 END) as below_safety_stock
                 FROM Stock
-                WHERE pmp IS NOT NULL AND quantite_en_stock IS NOT NULL
             """))
-            stats['total_value'] = result.scalar() or 0.0
-            
-            # Average days since last movement
-            result = db.session.execute(text("""
-                SELECT AVG(
-                    CASE 
-                        WHEN date_derniere_sortie IS NOT NULL AND date_derniere_sortie != ''
-                        THEN julianday('now') - julianday(date_derniere_sortie)
-                        ELSE NULL
-                    END
-                ) FROM Stock
-                WHERE date_derniere_sortie IS NOT NULL AND date_derniere_sortie != ''
-            """))
-            stats['avg_days_since_movement'] = result.scalar() or 0
-            
-            # Items below safety stock
-            result = db.session.execute(text("""
-                SELECT COUNT(*) FROM Stock 
-                WHERE quantite_en_stock < stock_securite
-                AND stock_securite > 0
-            """))
-            stats['below_safety_stock'] = result.scalar() or 0
+            row = result.fetchone()
+            stats['total_parts'] = row.total_parts or 0
+            stats['critical_stock'] = row.critical_stock or 0
+            stats['out_of_stock'] = row.out_of_stock or 0
+            stats['total_value'] = row.total_value or 0.0
+            stats['avg_days_since_movement'] = row.avg_days_since_movement or 0
+            stats['below_safety_stock'] = row.below_safety_stock or 0
             
             # Categories breakdown
             result = db.session.execute(text("""
@@ -227,6 +378,7 @@ class SparePartsService:
             """))
             stats['categories'] = [{'category': row[0], 'count': row[1]} for row in result.fetchall()]
             
+            self._store_cached_read('statistics', stats, stock_version)
             return stats
             
         except Exception as e:
@@ -246,47 +398,59 @@ class SparePartsService:
         try:
             query = """
                 SELECT 
-                    id,
-                    reference_article as part_number,
-                    designation_1 as part_name,
-                    designation_2 as description,
-                    categorie_article as category,
-                    quantite_en_stock as quantity_on_hand,
-                    seuil_de_reappro_min as reorder_level,
-                    pmp as unit_cost,
-                    emplacement_de_l_article as location
-                FROM Stock 
-                WHERE designation_1 LIKE ? 
-                   OR reference_article LIKE ?
-                   OR designation_2 LIKE ?
-                   OR categorie_article LIKE ?
-                ORDER BY designation_1 ASC 
-                LIMIT :limit
+                    s.id,
+                    s.reference_article as part_number,
+                    s.designation_1 as part_name,
+                    s.designation_2 as description,
+                    s.categorie_article as category,
+                    s.quantite_en_stock as quantity_on_hand,
+                    s.seuil_de_reappro_min as reorder_level,
+                    s.pmp as unit_cost,
+                    s.emplacement_de_l_article as location
+                FROM Stock s
             """
+            params = {"limit": limit}
             
-            search_pattern = f"%{search_term}%"
-            result = db.session.execute(text(query), {
-                "search1": search_pattern,
-                "search2": search_pattern, 
-                "search3": search_pattern,
-                "search4": search_pattern,
-                "limit": limit
-            })
-            rows = result.fetchall()
-            
-            search_results = []
-            for row in rows:
-                search_results.append({
-                    'id': row[0],
-                    'part_number': row[1] or '',
-                    'part_name': row[2] or '',
-                    'description': row[3] or '',
-                    'category': row[4] or '',
-                    'quantity_on_hand': row[5] or 0,
-                    'reorder_level': row[6] or 0,
-                    'unit_cost': row[7] or 0.0,
-                    'location': row[8] or ''
-                })
+            like_condition = """(
+                    s.designation_1 LIKE :pattern 
+                    OR s.reference_article LIKE :pattern
+                    OR s.designation_2 LIKE :pattern
+                    OR s.categorie_article LIKE :pattern
+                )"""
+            params["pattern"] = f"%{search_term}%"
+            
+            # Terms shorter than a trigram, or holding LIKE wildcards, keep
+            # the plain LIKE scan. Longer terms narrow the rows through the
+            # trigram index first; it folds Unicode case ("élan" finds
+            # "Élan") where LIKE folds ASCII only, so LIKE re-checks its
+            # candidates and both paths return the same rows
+            if (len(search_term) >= 3 and '%' not in search_term and '_' not in search_term
+                    and self._stock_fts_ready()):
+                query += f"""
+                JOIN Stock_fts ON Stock_fts.rowid = s.id
+                WHERE Stock_fts MATCH :match
+                  AND {like_condition}
+                """
+                params["match"] = '"' + search_term.replace('"', '""') + '"'
+            else:
+                query += f"""
+                WHERE {like_condition}
+                """
+            
+            query += " ORDER BY s.designation_1 ASC LIMIT :limit"
+            
+            result = db.session.execute(text(query), params)
+            search_results = [{
+                'id': row['id'],
+                'part_number': row['part_number'] or '',
+                'part_name': row['part_name'] or '',
+                'description': row['description'] or '',
+                'category': row['category'] or '',
+                'quantity_on_hand': row['quantity_on_hand'] or 0,
+                'reorder_level': row['reorder_level'] or 0,
+                'unit_cost': row['unit_cost'] or 0.0,
+                'location': row['location'] or ''
+            } for row in result.yield_per(_ROW_BATCH_SIZE).mappings()]
             
             return search_results
             
@@ -324,23 +488,23 @@ class SparePartsService:
             """
             
             result = db.session.execute(text(query))
-            rows = result.fetchall()
-            
             suggestions = []
-            for row in rows:
-                suggested_qty = max(row[6] or 0, (row[4] or 0) * 2)  # Economic order qty or 2x reorder level
+            for row in result.yield_per(_ROW_BATCH_SIZE).mappings():
+                reorder_level = row['reorder_level'] or 0
+                unit_cost = row['unit_cost'] or 0.0
+                suggested_qty = max(row['economic_order_qty'] or 0, reorder_level * 2)  # Economic order qty or 2x reorder level
                 
                 suggestions.append({
-                    'id': row[0],
-                    'part_number': row[1] or '',
-                    'part_name': row[2] or '',
-                    'current_stock': row[3] or 0,
-                    'reorder_level': row[4] or 0,
-                    'max_quantity': row[5] or 0,
+                    'id': row['id'],
+                    'part_number': row['part_number'] or '',
+                    'part_name': row['part_name'] or '',
+                    'current_stock': row['current_stock'] or 0,
+                    'reorder_level': reorder_level,
+                    'max_quantity': row['max_quantity'] or 0,
                     'suggested_order_qty': suggested_qty,
-                    'unit_cost': row[7] or 0.0,
-                    'estimated_cost': suggested_qty * (row[7] or 0.0),
-                    'urgency': row[8]
+                    'unit_cost': unit_cost,
+                    'estimated_cost': suggested_qty * unit_cost,
+                    'urgency': row['urgency']
                 })
             
             return suggestions
@@ -351,6 +515,13 @@ class SparePartsService:
     
     def get_inventory_overview(self):
         """Get inventory overview with categories and status."""
+        cached = self._get_cached_read('inventory_overview')
+        if cached is not None:
+            return cached
+        # Taken before querying, so a write that lands meanwhile leaves the
+        # stored result already stale
+        stock_version = self._stock_version
+        
         try:
             query = """
                 SELECT 
@@ -367,19 +538,16 @@ class SparePartsService:
             """
             
             result = db.session.execute(text(query))
-            rows = result.fetchall()
-            
-            overview = []
-            for row in rows:
-                overview.append({
-                    'category': row[0] or 'Uncategorized',
-                    'total_items': row[1] or 0,
-                    'total_quantity': row[2] or 0,
-                    'total_value': row[3] or 0.0,
-                    'critical_items': row[4] or 0,
-                    'out_of_stock_items': row[5] or 0
-                })
-            
+            overview = [{
+                'category': row['category'] or 'Uncategorized',
+                'total_items': row['total_items'] or 0,
+                'total_quantity': row['total_quantity'] or 0,
+                'total_value': row['total_value'] or 0.0,
+                'critical_items': row['critical_items'] or 0,
+                'out_of_stock_items': row['out_of_stock_items'] or 0
+            } for row in result.yield_per(_ROW_BATCH_SIZE).mappings()]
+            
+            self._store_cached_read('inventory_overview', overview, stock_version)
             return overview
             
         except Exception as e:
@@ -388,6 +556,13 @@ class SparePartsService:
     
     def get_critical_alerts(self):
         """Get critical alerts for spare parts management."""
+        cached = self._get_cached_read('critical_alerts')
+        if cached is not None:
+            return cached
+        # Taken before querying, so a write that lands meanwhile leaves the
+        # stored result already stale
+        stock_version = self._stock_version
+        
         try:
             alerts = []
             
@@ -430,6 +605,7 @@ class SparePartsService:
                     'items': row[1] if row[1] else ''
                 })
             
+            self._store_cached_read('critical_alerts', alerts, stock_version)
             return alerts
             
         except Exception as e:
@@ -475,6 +651,7 @@ class SparePartsService:
                 pass
             
             db.session.commit()
+            self.invalidate_cached_reads()
             
             return {
                 'success': True,
@@ -567,6 +744,7 @@ class SparePartsService:
                 logger.warning(f"Could not log stock movement: {e}")
             
             db.session.commit()
+            self.invalidate_cached_reads()
             
             return {
                 'success': True,
@@ -605,10 +783,8 @@ class SparePartsService:
                 params = {"limit": limit}
             
             result = db.session.execute(text(query), params)
-            rows = result.fetchall()
-            
             movements = []
-            for row in rows:
+            for row in result.yield_per(_ROW_BATCH_SIZE):
                 movements.append({
                     'id': row[0],
                     'part_id': row[1],
@@ -633,6 +809,13 @@ class SparePartsService:
     
     def get_stock_analytics(self):
         """Get advanced stock analytics and insights."""
+        cached = self._get_cached_read('stock_analytics')
+        if cached is not None:
+            return cached
+        # Taken before querying, so a write that lands meanwhile leaves the
+        # stored result already stale
+        stock_version = self._stock_version
+        
         try:
             analytics = {}
             
@@ -783,6 +966,7 @@ class SparePartsService:
                 })
             analytics['inventory_aging'] = inventory_aging
             
+            self._store_cached_read('stock_analytics', analytics, stock_version)
             return analytics
             
         except Exception as e:
@@ -811,27 +995,26 @@ class SparePartsService:
                 FROM Stock 
                 WHERE 1=1
             """
-            params = []
+            params = {}
             
             # Search term filter
             if search_term:
                 query += """ AND (
-                    designation_1 LIKE ? OR 
-                    reference_article LIKE ? OR 
-                    designation_2 LIKE ?
+                    designation_1 LIKE :pattern OR 
+                    reference_article LIKE :pattern OR 
+                    designation_2 LIKE :pattern
                 )"""
-                search_pattern = f"%{search_term}%"
-                params.extend([search_pattern, search_pattern, search_pattern])
+                params["pattern"] = f"%{search_term}%"
             
             # Category filter
             if category:
-                query += " AND categorie_article = ?"
-                params.append(category)
+                query += " AND categorie_article = :category"
+                params["category"] = category
             
             # Location filter
             if location:
-                query += " AND emplacement_de_l_article LIKE ?"
-                params.append(f"%{location}%")
+                query += " AND emplacement_de_l_article LIKE :location"
+                params["location"] = f"%{location}%"
             
             # Status filter
             if status == 'critical':
@@ -844,22 +1027,18 @@ class SparePartsService:
             query += " ORDER BY designation_1 ASC LIMIT 100"
             
             result = db.session.execute(text(query), params)
-            rows = result.fetchall()
-            
-            search_results = []
-            for row in rows:
-                search_results.append({
-                    'id': row[0],
-                    'part_number': row[1] or '',
-                    'part_name': row[2] or '',
-                    'description': row[3] or '',
-                    'category': row[4] or '',
-                    'quantity_on_hand': row[5] or 0,
-                    'reorder_level': row[6] or 0,
-                    'unit_cost': row[7] or 0.0,
-                    'location': row[8] or '',
-                    'stock_status': row[9]
-                })
+            search_results = [{
+                'id': row['id'],
+                'part_number': row['part_number'] or '',
+                'part_name': row['part_name'] or '',
+                'description': row['description'] or '',
+                'category': row['category'] or '',
+                'quantity_on_hand': row['quantity_on_hand'] or 0,
+                'reorder_level': row['reorder_level'] or 0,
+                'unit_cost': row['unit_cost'] or 0.0,
+                'location': row['location'] or '',
+                'stock_status': row['stock_status']
+            } for row in result.yield_per(_ROW_BATCH_SIZE).mappings()]
             
             return search_results
             
@@ -10,6 +10,7 @@ from typing import List, Dict, Tuple, Any, Optional
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 from models import db
+from services.excel_processor import replace_non_word_chars
 from models.base_models import UploadHistory, TableMetadata
 from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Table, text, inspect
 from sqlalchemy.dialects import sqlite, postgresql
@@ -392,12 +393,8 @@ class UniversalFileProcessor:
     
     def sanitize_table_name(self, name: str) -> str:
         """Convert sheet name to valid table name."""
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'table_' + name
@@ -414,12 +411,8 @@ class UniversalFileProcessor:
             return 'unnamed_column'
         
         name = str(name)
-        # Remove special characters and replace with underscore
-        name = re.sub(r'[^\w\s]', '_', name)
-        # Replace spaces with underscore
-        name = re.sub(r'\s+', '_', name)
-        # Remove multiple underscores
-        name = re.sub(r'_+', '_', name)
+        # Replace special characters and spaces with single underscores
+        name = replace_non_word_chars(name)
         # Ensure it starts with letter or underscore
         if name and name[0].isdigit():
             name = 'col_' + name